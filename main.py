@@ -1,17 +1,33 @@
 # Version:0.6
+import sys
+
+# Первым: фиксирует момент запуска для отчёта о времени старта
+from rutube_startup import mark
 from rutube_logger import logger
-from rutube_downloader import RutubeDownloader
-from rutube_gui import create_gui
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Аргументы командной строки — консольный режим без tkinter
+        from rutube_cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+
+    from rutube_downloader import RutubeDownloader
+    from rutube_functions import load_config
+    from rutube_gui import create_gui
+    mark("импорт модулей")
+
     # Настройка логгера (один раз при запуске приложения)
+    config = load_config()
     logger.setup(
         log_file='rutube_app.log',
         gui_widget=None,  # Будет установлен позже в GUI
         max_log_size=10 * 1024 * 1024,  # 10 MB
         backup_count=5,
-        log_level='DEBUG'  # 'INFO' в продакшене
+        log_level='DEBUG',  # 'INFO' в продакшене
+        async_mode=config.get("async_logging", True),
+        queue_size=config.get("log_queue_size", 10000)
     )
+    mark("логгер")
     downloader = RutubeDownloader()
+    mark("RutubeDownloader")
     create_gui(downloader)
-
@@ -0,0 +1,84 @@
+import re
+
+from rutube_bandwidth import bandwidth
+from rutube_http import get_session, default_timeout
+from rutube_logger import logger
+
+API_BASE = "https://rutube.ru/api"
+VIDEO_URL = "https://rutube.ru/video/{}/"
+VIDEO_ID_RE = re.compile(r"^[a-z0-9]{32}$")
+CHANNEL_ID_RE = re.compile(r"rutube\.ru/(?:channel|api/profile/user)/(\d+)")
+
+
+class RutubeAPIError(Exception):
+    """Ошибка обращения к JSON API Rutube"""
+
+
+def extract_channel_id(channel_url):
+    """Извлекает числовой ID канала из ссылки вида https://rutube.ru/channel/<id>/"""
+    match = CHANNEL_ID_RE.search(channel_url)
+    return match.group(1) if match else None
+
+
+def _get_json(url, session, timeout=None):
+    timeout = timeout or default_timeout()
+    try:
+        with bandwidth.job() as bw_key:
+            response = session.get(url, timeout=timeout)
+            bandwidth.consume(bw_key, len(response.content))
+    except Exception as e:
+        raise RutubeAPIError(f"{url} — {e}") from e
+    if response.status_code != 200:
+        raise RutubeAPIError(f"{url} — HTTP {response.status_code}")
+    try:
+        return response.json()
+    except ValueError as e:
+        raise RutubeAPIError(f"{url} — некорректный JSON") from e
+
+
+def get_channel_name(channel_id, session=None, api_base=API_BASE):
+    """Название канала из профиля автора"""
+    session = session or get_session()
+    data = _get_json(f"{api_base}/profile/user/{channel_id}/", session)
+    return data.get("name") or "Unnamed_Channel"
+
+
+def iter_channel_videos(channel_id, session=None, api_base=API_BASE, max_pages=1000):
+    """
+    Постранично обходит JSON-список видео канала.
+
+    Yields:
+        dict: элемент списка results (id, title, video_url, author, ...)
+    """
+    session = session or get_session()
+    for page in range(1, max_pages + 1):
+        data = _get_json(f"{api_base}/video/person/{channel_id}/?page={page}", session)
+        results = data.get("results") or []
+        logger.debug(f"API: страница {page}, видео: {len(results)}")
+        for item in results:
+            if VIDEO_ID_RE.match(str(item.get("id", ""))):
+                yield item
+        if not data.get("has_next") or not results:
+            break
+
+
+def stream_video_links_api(channel_url, session=None, api_base=API_BASE):
+    """
+    Список видео канала через JSON API без браузера: название канала
+    запрашивается сразу, ссылки выдаются генератором по мере обхода страниц.
+
+    Returns:
+        tuple: (название канала, генератор ссылок)
+
+    Raises:
+        RutubeAPIError: если ссылка не содержит ID канала или API недоступно
+    """
+    channel_id = extract_channel_id(channel_url)
+    if not channel_id:
+        raise RutubeAPIError(f"Не удалось определить ID канала: {channel_url}")
+
+    session = session or get_session()
+    title = get_channel_name(channel_id, session, api_base)
+    links = (VIDEO_URL.format(item["id"]) for item in iter_channel_videos(channel_id, session, api_base))
+    return title, links
+
@@ -0,0 +1,94 @@
+import itertools
+import threading
+import time
+from datetime import datetime
+
+
+class BandwidthLimiter:
+    """
+    Общий для процесса лимит скорости (token bucket) с расписанием по времени суток.
+
+    Лимит делится поровну между активными задачами (загрузки, обложки,
+    мета-данные): каждая задача получает limit / N байт/с и накопленный
+    запас не больше чем на burst секунд.
+    """
+
+    def __init__(self, limit_kbps=0, schedule=None, burst=1.0):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs = {}  # id задачи -> момент, с которого разрешены следующие байты
+        self.burst = burst
+        self.configure(limit_kbps, schedule)
+
+    def configure(self, limit_kbps=0, schedule=None):
+        """
+        Args:
+            limit_kbps: лимит по умолчанию в КБ/с (0 — без ограничений)
+            schedule: [{"start": "09:00", "end": "18:00", "limit_kbps": 2048}, ...];
+                интервал может переходить через полночь
+        """
+        parsed = []
+        for item in schedule or []:
+            start = datetime.strptime(item["start"], "%H:%M").time()
+            end = datetime.strptime(item["end"], "%H:%M").time()
+            parsed.append((start, end, int(item.get("limit_kbps", 0))))
+        with self._lock:
+            self.limit_kbps = int(limit_kbps or 0)
+            self.schedule = parsed
+
+    def current_limit(self, now=None):
+        """Действующий лимит в байтах/с (0 — без ограничений)"""
+        moment = (now or datetime.now()).time()
+        limit = self.limit_kbps
+        for start, end, kbps in self.schedule:
+            inside = start <= moment < end if start <= end else (moment >= start or moment < end)
+            if inside:
+                limit = kbps
+                break
+        return limit * 1024
+
+    def register(self):
+        """Регистрирует активную задачу; возвращает её ключ для consume/unregister"""
+        with self._lock:
+            key = next(self._ids)
+            self._jobs[key] = time.monotonic()
+            return key
+
+    def unregister(self, key):
+        with self._lock:
+            self._jobs.pop(key, None)
+
+    def consume(self, key, count):
+        """Учитывает count байт задачи key; при превышении её доли лимита ждёт"""
+        limit = self.current_limit()
+        if not limit or count <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            share = limit / max(1, len(self._jobs))
+            allowed_at = max(self._jobs.get(key, now), now - self.burst) + count / share
+            self._jobs[key] = allowed_at
+        delay = allowed_at - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def job(self):
+        """Контекстный менеджер задачи: with bandwidth.job() as key: ..."""
+        return _BandwidthJob(self)
+
+
+class _BandwidthJob:
+    def __init__(self, limiter):
+        self.limiter = limiter
+        self.key = None
+
+    def __enter__(self):
+        self.key = self.limiter.register()
+        return self.key
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.limiter.unregister(self.key)
+
+
+# Глобальный лимитер, общий для всех потоков загрузки
+bandwidth = BandwidthLimiter()
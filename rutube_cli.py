@@ -0,0 +1,200 @@
+"""
+Консольный режим Rutube Downloader (без tkinter) — для серверов и cron.
+
+Примеры:
+    python rutube_cli.py discover https://rutube.ru/channel/12345/
+    python rutube_cli.py fetch-metadata https://rutube.ru/channel/12345/
+    python rutube_cli.py download https://rutube.ru/channel/12345/ --workers 2
+    python rutube_cli.py sync https://rutube.ru/channel/12345/
+    python rutube_cli.py resume
+    python rutube_cli.py batch https://rutube.ru/channel/1/ https://rutube.ru/channel/2/ --workers 4
+    python rutube_cli.py watch https://rutube.ru/channel/1/ https://rutube.ru/channel/2/ --interval 1800
+"""
+import argparse
+import signal
+import sys
+
+from rutube_downloader import RutubeDownloader
+from rutube_functions import load_config
+from rutube_logger import logger
+from rutube_scheduler import SCHEDULING_POLICIES
+from rutube_watch import ChannelWatcher
+
+
+def _install_interrupt_handler(downloader):
+    """Первый Ctrl+C — мягкая отмена загрузок, второй — немедленный выход"""
+
+    def handler(signum, frame):
+        if downloader.cancelled:
+            raise KeyboardInterrupt
+        logger.warning("🛑 Отмена... (повторный Ctrl+C — немедленный выход)")
+        downloader.cancel_download()
+
+    signal.signal(signal.SIGINT, handler)
+
+
+def _apply_options(downloader, args):
+    if args.output:
+        downloader.output_dir = args.output
+    if getattr(args, "workers", None):
+        downloader.max_workers = args.workers
+    if getattr(args, "fragments", None):
+        downloader.concurrent_fragment_count = args.fragments
+    if getattr(args, "metadata_workers", None):
+        downloader.metadata_workers = args.metadata_workers
+    if getattr(args, "policy", None):
+        downloader.scheduling_policy = args.policy
+    if args.incremental:
+        downloader.incremental_scan = True
+    if getattr(args, "limit", None) is not None:
+        downloader.bandwidth_limit_kbps = args.limit
+        downloader._apply_bandwidth()
+
+
+def _exit_code(downloader, ok=True):
+    """130 — отменено, 1 — была ошибка (в том числе неудачная загрузка), 0 — успех"""
+    if downloader.cancelled:
+        return 130
+    return 0 if ok and not downloader.failed_downloads else 1
+
+
+def cmd_discover(downloader, args):
+    links, channel = downloader.get_video_links(args.url)
+    logger.info(f"Канал: {channel}, видео: {len(links)}")
+    for link in links:
+        print(link)
+    return 0
+
+
+def cmd_fetch_metadata(downloader, args):
+    links, channel = downloader.get_video_links(args.url)
+    metas = downloader.fetch_all_metadata(links)
+    downloader.save_metadata(metas)
+    logger.info(f"Мета-данные: {len(metas)} из {len(links)} видео сохранены в {downloader.last_folder}")
+    return 0
+
+
+def cmd_download(downloader, args):
+    links, channel = downloader.get_video_links(args.url)
+    metas = downloader.fetch_all_metadata(links)
+    downloader.save_metadata(metas)
+    logger.info(f"⏬ Загрузка канала {channel}: {len(metas)} видео")
+    downloader.download_all(metas)
+    return _exit_code(downloader)
+
+
+def cmd_sync(downloader, args):
+    stats = downloader.download_channel_streaming(args.url)
+    return _exit_code(downloader, not stats.get("failed"))
+
+
+def cmd_resume(downloader, args):
+    count = downloader.pending_jobs_count()
+    logger.info(f"Незавершённых загрузок: {count}")
+    if count:
+        downloader.resume_pending()
+    return _exit_code(downloader)
+
+
+def cmd_batch(downloader, args):
+    urls = list(args.urls)
+    if args.file:
+        with open(args.file, "r", encoding="utf-8") as f:
+            urls += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    if not urls:
+        logger.error("Не указаны каналы")
+        return 2
+    found = downloader.download_channels(urls, args.discovery_workers)
+    return _exit_code(downloader, found == len(urls))
+
+
+def cmd_watch(downloader, args):
+    config = load_config()
+    channels = args.urls or config.get("watch_channels", [])
+    interval = args.interval or config.get("watch_interval", 3600)
+    jitter = args.jitter if args.jitter is not None else config.get("watch_jitter", 0.1)
+    watcher = ChannelWatcher(downloader, channels, interval, jitter, start_spread=0 if args.once else 30)
+    watcher.run(once=args.once)
+    return _exit_code(downloader)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="rutube_cli", description="Rutube Downloader — консольный режим")
+    parser.add_argument("--output", help="папка загрузок (по умолчанию из rutube_config.json)")
+    parser.add_argument("--log-file", default="rutube_app.log", help="файл лога ('' — без файла)")
+    parser.add_argument("--log-level", default="INFO", help="DEBUG / INFO / WARNING / ERROR")
+    parser.add_argument("--incremental", action="store_true",
+                        help="остановить обход канала после серии уже известных видео")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_download_options(p):
+        p.add_argument("--workers", type=int, help="параллельных загрузок")
+        p.add_argument("--fragments", type=int, help="потоков на файл")
+        p.add_argument("--metadata-workers", type=int, help="потоков получения мета-данных")
+        p.add_argument("--policy", choices=list(SCHEDULING_POLICIES), help="порядок загрузки")
+        p.add_argument("--limit", type=int, help="лимит скорости, КБ/с (0 — без ограничений)")
+
+    p = sub.add_parser("discover", help="вывести ссылки на видео канала")
+    p.add_argument("url")
+    p.set_defaults(func=cmd_discover)
+
+    p = sub.add_parser("fetch-metadata", help="получить мета-данные и сохранить metadata.csv")
+    p.add_argument("url")
+    p.add_argument("--metadata-workers", type=int, help="потоков получения мета-данных")
+    p.set_defaults(func=cmd_fetch_metadata)
+
+    p = sub.add_parser("download", help="скачать канал целиком (список → мета-данные → загрузка)")
+    p.add_argument("url")
+    add_download_options(p)
+    p.set_defaults(func=cmd_download)
+
+    p = sub.add_parser("sync", help="потоковая синхронизация канала (загрузка с первого найденного видео)")
+    p.add_argument("url")
+    add_download_options(p)
+    p.set_defaults(func=cmd_sync)
+
+    p = sub.add_parser("resume", help="продолжить незавершённые загрузки из jobs.db")
+    add_download_options(p)
+    p.set_defaults(func=cmd_resume)
+
+    p = sub.add_parser("batch", help="скачать несколько каналов общим пулом загрузок")
+    p.add_argument("urls", nargs="*", help="ссылки на каналы")
+    p.add_argument("--file", help="файл со ссылками на каналы (по одной в строке)")
+    p.add_argument("--discovery-workers", type=int, help="каналов, обходимых одновременно")
+    add_download_options(p)
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser("watch", help="наблюдение за каналами: периодически скачивать новые видео")
+    p.add_argument("urls", nargs="*", help="каналы (по умолчанию watch_channels из конфигурации)")
+    p.add_argument("--interval", type=int, help="интервал опроса, с (по умолчанию watch_interval)")
+    p.add_argument("--jitter", type=float, help="случайный разброс интервала, доля (0.1 — ±10%%)")
+    p.add_argument("--once", action="store_true", help="проверить каждый канал один раз и выйти")
+    add_download_options(p)
+    p.set_defaults(func=cmd_watch)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    config = load_config()
+    logger.setup(log_file=args.log_file or None, gui_widget=None, max_log_size=10 * 1024 * 1024,
+                 backup_count=5, log_level=args.log_level,
+                 async_mode=config.get("async_logging", True),
+                 queue_size=config.get("log_queue_size", 10000))
+
+    downloader = RutubeDownloader()
+    _apply_options(downloader, args)
+    _install_interrupt_handler(downloader)
+    try:
+        return args.func(downloader, args)
+    except KeyboardInterrupt:
+        logger.error("🛑 Прервано")
+        return 130
+    except Exception as e:
+        logger.error(f"❌ Ошибка: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import threading
+import time
+
+from rutube_logger import logger
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD-регулятор числа параллельных загрузок (max_workers) и потоков
+    на файл (concurrent_fragment_count).
+
+    Раз в interval секунд сравнивает суммарную скорость и долю ошибок с
+    предыдущим окном: при ошибках оба параметра уменьшаются вдвое, при росте
+    скорости один из параметров (по очереди) увеличивается на 1, при падении
+    скорости без ошибок последнее увеличение откатывается.
+    """
+
+    def __init__(self, workers, fragments, workers_range=(1, 8), fragments_range=(1, 16),
+                 interval=15.0, error_threshold=0.1):
+        self.workers_range = tuple(workers_range)
+        self.fragments_range = tuple(fragments_range)
+        self.workers = self._clamp(workers, self.workers_range)
+        self.fragments = self._clamp(fragments, self.fragments_range)
+        self.interval = interval
+        self.error_threshold = error_threshold
+
+        self._lock = threading.Lock()
+        self._slots = threading.Condition(self._lock)
+        self._active = 0
+        self._bytes = 0
+        self._errors = 0
+        self._completed = 0
+        self._window_start = time.monotonic()
+        self._last_throughput = 0.0
+        self._next_knob = "workers"
+        self._last_increase = None
+
+    @staticmethod
+    def _clamp(value, bounds):
+        return max(bounds[0], min(bounds[1], value))
+
+    def acquire(self, cancelled=None, timeout=0.5):
+        """
+        Ждёт свободный слот загрузки (не больше self.workers одновременно).
+
+        Returns:
+            bool: False, если ожидание прервано через cancelled()
+        """
+        with self._slots:
+            while self._active >= self.workers:
+                if cancelled and cancelled():
+                    return False
+                self._slots.wait(timeout)
+            self._active += 1
+            return True
+
+    def release(self):
+        with self._slots:
+            self._active -= 1
+            self._slots.notify()
+
+    def record_bytes(self, count):
+        with self._lock:
+            self._bytes += count
+        self.maybe_adjust()
+
+    def record_error(self):
+        with self._lock:
+            self._errors += 1
+        self.maybe_adjust()
+
+    def record_success(self):
+        with self._lock:
+            self._completed += 1
+        self.maybe_adjust()
+
+    def maybe_adjust(self):
+        """Пересматривает параметры, если прошло interval секунд с прошлого решения"""
+        with self._slots:
+            now = time.monotonic()
+            elapsed = now - self._window_start
+            if elapsed < self.interval:
+                return
+            throughput = self._bytes / elapsed
+            attempts = self._errors + self._completed
+            error_rate = self._errors / attempts if attempts else 0.0
+            old = (self.workers, self.fragments)
+
+            if self._errors and error_rate >= self.error_threshold:
+                self.workers = self._clamp(self.workers // 2, self.workers_range)
+                self.fragments = self._clamp(self.fragments // 2, self.fragments_range)
+                self._last_increase = None
+                decision = "уменьшение (ошибки)"
+            elif throughput >= self._last_throughput * 0.95:
+                knob = self._next_knob
+                self._next_knob = "fragments" if knob == "workers" else "workers"
+                if knob == "workers":
+                    self.workers = self._clamp(self.workers + 1, self.workers_range)
+                else:
+                    self.fragments = self._clamp(self.fragments + 1, self.fragments_range)
+                self._last_increase = knob if (self.workers, self.fragments) != old else None
+                decision = f"увеличение ({knob})"
+            elif self._last_increase:
+                if self._last_increase == "workers":
+                    self.workers = self._clamp(self.workers - 1, self.workers_range)
+                else:
+                    self.fragments = self._clamp(self.fragments - 1, self.fragments_range)
+                decision = f"откат ({self._last_increase})"
+                self._last_increase = None
+            else:
+                decision = "без изменений"
+
+            logger.info(
+                f"[auto] {throughput / 1024 / 1024:.2f} МБ/с, ошибок {self._errors}/{attempts} "
+                f"→ {decision}: файлов {old[0]}→{self.workers}, потоков {old[1]}→{self.fragments}"
+            )
+            self._last_throughput = throughput
+            self._bytes = self._errors = self._completed = 0
+            self._window_start = now
+            self._slots.notify_all()
@@ -1,13 +1,23 @@
 import concurrent.futures
 import os
-from threading import Lock
+import queue
+from threading import Event, Lock, Thread
 
 from rutube_functions import (
     get_video_links, fetch_metadata, fetch_and_cache_metadata,
     save_metadata_csv, save_description, save_thumbnail,
-    download_video, save_config, load_config
+    download_video, save_config, load_config, meta_video_id, FolderIndex,
+    video_file_prefix, video_filename, file_checksum, byte_delta_hook, progress_info_hook,
+    video_id_from_url, PARTIAL_POLICIES
 )
+from rutube_api import API_BASE
+from rutube_bandwidth import bandwidth
+from rutube_concurrency import AdaptiveConcurrency
+from rutube_http import configure as configure_http, log_connection_stats
 from rutube_logger import logger
+from rutube_pipeline import StreamingPipeline
+from rutube_scheduler import order_jobs, RoundRobin, duration_seconds
+from rutube_storage import open_metadata_store, open_job_store, open_manifest
 
 
 class RutubeDownloader:
@@ -15,45 +25,217 @@ class RutubeDownloader:
         config = load_config()
         self.output_dir = config.get("download_folder", "rutube_downloads")
         self.last_folder = ""
-        self._cancel_flag = False
-        self._cancel_lock = Lock()  # Потокобезопасность для cancel_flag
+        self._cancel_event = Event()  # Отмена: проверяется в progress hook yt-dlp и между задачами
+        self._pause_event = Event()  # Пауза: установлен — новые задачи не стартуют, активные стоят
         self._status_callback = None  # GUI callback
+        self._progress_callback = None  # GUI callback прогресса: (index, info)
+        self._jobs = None  # JobStore текущей пачки загрузок
+        self.failed_downloads = 0  # Неудачных загрузок за время работы (код выхода CLI)
+        self._folder_indexes = {}  # Папка канала -> FolderIndex
+        self._manifests = {}  # Папка канала -> ManifestStore
+        self._index_lock = Lock()
         self.concurrent_fragment_count = config.get("concurrent_fragment_count", 4)
         self.max_workers = config.get("max_workers", 1)
+        self.metadata_workers = config.get("metadata_workers", 4)  # Потоков получения мета-данных
+        self.metadata_extra_fields = tuple(config.get("metadata_extra_fields", []))  # Доп. поля yt-dlp
+        self.pipeline_queue_size = config.get("pipeline_queue_size", 16)  # Размер очередей потокового режима
+        self.partial_policy = self._check_partial_policy(config.get("partial_policy", "resume"))  # resume / restart для .part-фрагментов
+        # Автоподбор max_workers / concurrent_fragment_count в заданных границах
+        self.auto_concurrency = config.get("auto_concurrency", False)
+        self.auto_workers_range = tuple(config.get("auto_workers_range", [1, 8]))
+        self.auto_fragments_range = tuple(config.get("auto_fragments_range", [1, 16]))
+        self.auto_interval = config.get("auto_interval", 15)
+        self._controller = None  # AdaptiveConcurrency текущей пачки
+        # Общий лимит скорости (КБ/с, 0 — без ограничений) и расписание по времени суток
+        self.bandwidth_limit_kbps = config.get("bandwidth_limit_kbps", 0)
+        self.bandwidth_schedule = config.get("bandwidth_schedule", [])
+        self._apply_bandwidth()
+        self.scheduling_policy = config.get("scheduling_policy", "fifo")  # Порядок запуска загрузок
+        # Общий пул HTTP-соединений (API, обложки)
+        configure_http(config.get("http_pool_size", 8), config.get("http_timeout", 15),
+                       config.get("http_retries", 3))
+        self.discovery_workers = config.get("discovery_workers", 3)  # Каналов, обходимых одновременно (пакетный режим)
+        # Инкрементальное сканирование: остановка после серии уже известных видео
+        self.incremental_scan = config.get("incremental_scan", False)
+        self.incremental_stop_after = config.get("incremental_stop_after", 30)
+        self.api_base = config.get("api_base", API_BASE)  # Адрес JSON API Rutube
 
     def set_status_callback(self, callback):
         """Устанавливает callback для обновления GUI-таблицы"""
         self._status_callback = callback
 
-    def update_settings(self, concurrent_fragment_count, max_workers):
+    def set_progress_callback(self, callback):
+        """
+        Устанавливает callback(index, info) живого прогресса загрузки
+        (info — словарь из progress_info_hook, не чаще 2 раз в секунду на видео)
+        """
+        self._progress_callback = callback
+
+    @staticmethod
+    def _check_partial_policy(policy):
+        """Политика из PARTIAL_POLICIES; неизвестная заменяется на resume"""
+        if policy not in PARTIAL_POLICIES:
+            logger.warning(f"Неизвестная политика фрагментов: {policy}, используется resume")
+            return "resume"
+        return policy
+
+    def _apply_bandwidth(self):
+        try:
+            bandwidth.configure(self.bandwidth_limit_kbps, self.bandwidth_schedule)
+        except (KeyError, ValueError) as e:
+            logger.error(f"Некорректное расписание лимита скорости: {e}")
+            bandwidth.configure(self.bandwidth_limit_kbps)
+
+    def update_settings(self, concurrent_fragment_count, max_workers, metadata_workers=None,
+                        partial_policy=None, auto_concurrency=None, bandwidth_limit_kbps=None,
+                        scheduling_policy=None):
         """Обновляет настройки загрузки и сохраняет в config"""
         self.concurrent_fragment_count = concurrent_fragment_count
         self.max_workers = max_workers
-        save_config("", self.output_dir, concurrent_fragment_count, max_workers)
+        if metadata_workers is not None:
+            self.metadata_workers = metadata_workers
+        if partial_policy is not None:
+            self.partial_policy = self._check_partial_policy(partial_policy)
+        if auto_concurrency is not None:
+            self.auto_concurrency = auto_concurrency
+        if bandwidth_limit_kbps is not None:
+            self.bandwidth_limit_kbps = bandwidth_limit_kbps
+            self._apply_bandwidth()
+        if scheduling_policy is not None:
+            self.scheduling_policy = scheduling_policy
+        save_config("", self.output_dir, concurrent_fragment_count, max_workers,
+                    metadata_workers=self.metadata_workers, partial_policy=self.partial_policy,
+                    auto_concurrency=self.auto_concurrency,
+                    bandwidth_limit_kbps=self.bandwidth_limit_kbps,
+                    scheduling_policy=self.scheduling_policy)
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
 
     def cancel_download(self):
-        """Флаг отмены загрузки"""
-        self._cancel_flag = True
+        """
+        Отмена загрузки: задачи в очереди снимаются, активные загрузки
+        прерываются через progress hook (фрагменты остаются для докачки)
+        """
+        self._cancel_event.set()
+
+    def reset_cancel(self):
+        self._cancel_event.clear()
+
+    @property
+    def paused(self):
+        return self._pause_event.is_set()
 
-    def get_video_links(self, url):
-        links, channel_name = get_video_links(url)
+    def pause(self):
+        """Пауза: новые задачи не запускаются, активные загрузки останавливаются в progress hook"""
+        self._pause_event.set()
+        logger.info("⏸ Загрузка приостановлена")
+
+    def resume(self):
+        """Снимает паузу"""
+        self._pause_event.clear()
+        logger.info("▶ Загрузка продолжена")
+
+    def wait_if_paused(self):
+        """Блокирует вызывающий поток, пока включена пауза (отмена прерывает ожидание)"""
+        while self._pause_event.is_set() and not self.cancelled:
+            self._cancel_event.wait(0.5)
+
+    def _pause_hook(self, d):
+        """Progress hook: на паузе скорость активной загрузки падает до нуля"""
+        self.wait_if_paused()
+
+    def known_video_ids(self, channel_name):
+        """ID видео из кэша мета-данных папки канала (пустое множество для нового канала)"""
+        folder = os.path.join(self.output_dir, channel_name)
+        if not os.path.isdir(folder):
+            return set()
+        with open_metadata_store(folder, self.metadata_extra_fields) as store:
+            return store.known_ids()
+
+    def get_video_links(self, url, incremental=None):
+        """
+        Список видео канала; папка канала становится last_folder.
+
+        Args:
+            incremental: остановить обход после incremental_stop_after известных
+                видео подряд (None — по настройке incremental_scan)
+        """
+        if incremental is None:
+            incremental = self.incremental_scan
+        known_ids = self.known_video_ids if incremental else None
+        links, channel_name = get_video_links(url, known_ids, self.incremental_stop_after, self.api_base)
         base_folder = os.path.join(self.output_dir, channel_name)
         os.makedirs(base_folder, exist_ok=True)
         self.last_folder = base_folder
         return links, channel_name
 
+    def new_video_links(self, links, folder=None):
+        """
+        Ссылки на видео, файлов которых нет в манифесте папки. Отметка done
+        в jobs.db без файла (удалён или перемещён) видео новым не делает —
+        это решает _download_groups() по индексу папки.
+        """
+        manifest = self.get_manifest(folder or self.last_folder)
+        return [link for link in links if not manifest.is_present(video_id_from_url(link))]
+
+    def _already_downloaded(self, jobs, manifest, folder_index, meta):
+        """
+        Видео скачано и файл на месте (манифест или индекс папки).
+        Скачанное без jobs.db (например, потоковым sync) закрывает задачу;
+        задача done без файла возвращается в очередь.
+        """
+        video_id = meta_video_id(meta)
+        if manifest.is_present(video_id):
+            if not jobs.is_done(video_id):
+                jobs.mark_done(video_id, manifest.get(video_id)["size"])
+            return True
+        if not jobs.is_done(video_id):
+            return False
+        if folder_index.exists(video_filename(meta)):
+            return True
+        logger.info(f"Файл загруженного ранее видео не найден, скачиваю заново: {meta.get('title')}")
+        jobs.mark_queued(video_id)
+        return False
+
+    def get_folder_index(self, folder=None, refresh=False):
+        """
+        Общий индекс файлов папки канала (по умолчанию — last_folder).
+
+        Args:
+            refresh: перечитать папку (один раз на пачку загрузок)
+        """
+        folder = folder or self.last_folder
+        with self._index_lock:
+            index = self._folder_indexes.get(folder)
+            if index is None:
+                index = self._folder_indexes[folder] = FolderIndex(folder)
+                return index
+        if refresh:
+            index.refresh()
+        return index
+
+    def get_manifest(self, folder=None):
+        """Манифест загруженных видео папки канала (по умолчанию — last_folder)"""
+        folder = folder or self.last_folder
+        with self._index_lock:
+            manifest = self._manifests.get(folder)
+            if manifest is None:
+                os.makedirs(folder, exist_ok=True)
+                manifest = self._manifests[folder] = open_manifest(folder)
+            return manifest
+
     def fetch_metadata(self, link):
         return fetch_metadata(link)
 
-    def fetch_all_metadata(self, links):
-        cache_path = os.path.join(self.last_folder, "metadata.json")
-        metadata_list = fetch_and_cache_metadata(links, cache_path)
+    def fetch_all_metadata(self, links, folder=None):
+        with open_metadata_store(folder or self.last_folder, self.metadata_extra_fields) as store:
+            metadata_list = fetch_and_cache_metadata(links, store, self.metadata_workers,
+                                                     extra_fields=self.metadata_extra_fields)
 
         def sort_key(meta):
-            date = meta.get("upload_date", "00000000")
-            duration = meta.get("duration_string", "00:00")
-            duration_numeric = int(duration.replace(":", "").zfill(4))
-            return (date, duration_numeric)
+            return meta.get("upload_date") or "00000000", duration_seconds(meta)
 
         metadata_list.sort(key=sort_key)
         return metadata_list
@@ -67,17 +249,7 @@ class RutubeDownloader:
         title = meta.get("title", "Без названия")
         desc = meta.get("description", "Описание отсутствует")
         thumb = meta.get("thumbnail")
-        date_raw = meta.get("upload_date", "00000000")
-        duration = meta.get("duration_string", "00:00").replace(":", "").zfill(4)
-
-        # Префикс: дата_время_
-        try:
-            prefix = (
-                f"{date_raw[:4]}.{date_raw[4:6]}.{date_raw[6:8]}_"
-                f"{duration[:2]}{duration[2:4]}_"
-            )
-        except Exception:
-            prefix = ""
+        prefix = video_file_prefix(meta)  # Префикс: дата_время_
 
         logger.info(f"[{index}/{total}] Скачивается: {title}")
         try:
@@ -88,50 +260,303 @@ class RutubeDownloader:
             logger.error(f"Ошибка при загрузке {title}: {e}")
 
     def process_video(self, meta_with_index):
-        index, total, meta = meta_with_index
+        """
+        Скачивает одно видео.
+
+        Args:
+            meta_with_index: (номер, всего, папка канала, мета-данные)
+
+        Returns:
+            bool: False, если загрузка завершилась ошибкой (отмена и пропуск — не ошибка)
+        """
+        index, total, folder, meta = meta_with_index
         title = meta.get("title", "Без названия")
         desc = meta.get("description", "Описание отсутствует")
         thumb = meta.get("thumbnail")
-        date_raw = meta.get("upload_date", "00000000")
-        duration = meta.get("duration_string", "00:00").replace(":", "").zfill(4)
-
-        try:
-            prefix = f"{date_raw[:4]}.{date_raw[4:6]}.{date_raw[6:8]}_{duration}_"
-        except Exception:
-            prefix = ""
+        prefix = video_file_prefix(meta)
+        video_id = meta_video_id(meta)
+        jobs = self._jobs
+        controller = self._controller
+        progress_callback = self._progress_callback
 
-        if self._cancel_flag:
+        self.wait_if_paused()
+        if self.cancelled:
             if self._status_callback:
                 self._status_callback(index - 1, "🛑 Отменено")
-            return
+            return True
+
+        manifest = self.get_manifest(folder)
+        if manifest.is_present(video_id):
+            logger.info(f"[{index}/{total}] [✓] Уже загружено (манифест): {title}")
+            if jobs:
+                jobs.mark_done(video_id, manifest.get(video_id)["size"])
+            if self._status_callback:
+                self._status_callback(index - 1, "✅ Готово")
+            return True
 
         logger.info(f"[{index}/{total}] Скачивается: {title}")
+        if jobs:
+            jobs.mark_running(video_id)
         try:
-            save_description(title, desc, self.last_folder, prefix)
-            save_thumbnail(title, thumb, self.last_folder, prefix)
-            download_video(meta, self.last_folder, prefix, self.concurrent_fragment_count)
+            folder_index = self.get_folder_index(folder)
+            existed = folder_index.exists(video_filename(meta, prefix))
+            save_description(title, desc, folder, prefix)
+            save_thumbnail(title, thumb, folder, prefix)
+            hooks = [self._pause_hook]
+            if progress_callback:
+                hooks.append(progress_info_hook(lambda info: progress_callback(index - 1, info)))
+            if controller:
+                path = download_video(meta, folder, prefix, controller.fragments,
+                                      self.partial_policy, folder_index,
+                                      progress_hooks=hooks + [byte_delta_hook(controller.record_bytes)],
+                                      on_error=lambda e: controller.record_error(),
+                                      cancel_event=self._cancel_event)
+                controller.record_success()
+            else:
+                path = download_video(meta, folder, prefix, self.concurrent_fragment_count,
+                                      self.partial_policy, folder_index, progress_hooks=hooks,
+                                      cancel_event=self._cancel_event)
 
+            # Контрольная сумма — только для только что скачанных файлов
+            size = os.path.getsize(path)
+            manifest.record(video_id, path, size, None if existed else file_checksum(path))
             logger.info(f"Видео загружено: {title}")
+            if jobs:
+                jobs.mark_done(video_id, size)
             if self._status_callback:
                 self._status_callback(index - 1, "✅ Готово")
         except Exception as e:
+            if self.cancelled:
+                # Прервано пользователем: задача вернётся при следующем запуске
+                if jobs:
+                    jobs.mark_queued(video_id)
+                if self._status_callback:
+                    self._status_callback(index - 1, "🛑 Отменено")
+                return True
             logger.error(f"Ошибка при загрузке {title}: {e}")
+            with self._index_lock:
+                self.failed_downloads += 1
+            if jobs:
+                jobs.mark_failed(video_id, e)
             if self._status_callback:
                 self._status_callback(index - 1, "❌ Ошибка")
+            return False
+        return True
 
     def download_all(self, metadata_list):
-        self._cancel_flag = False  # сброс перед началом
-        indexed = [(i + 1, len(metadata_list), meta) for i, meta in enumerate(metadata_list)]
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = [executor.submit(self.process_video, item) for item in indexed]
+        """Скачивает видео одного канала (папка last_folder)"""
+        self.reset_cancel()  # сброс перед началом
+        self._pause_event.clear()
+        self._download_groups([(self.last_folder, metadata_list)])
+
+    def _prepare_group(self, jobs, folder, metadata_list, offset, total, workers):
+        """
+        Ставит видео канала в jobs.db и возвращает задачи process_video
+        в порядке scheduling_policy (уже скачанные отмечаются и пропускаются)
+        """
+        folder_index = self.get_folder_index(folder, refresh=True)
+        jobs.enqueue_many([(meta_video_id(meta), folder, meta) for meta in metadata_list])
+        manifest = self.get_manifest(folder)
+        indexed = []
+        for i, meta in enumerate(metadata_list, offset):
+            if self._already_downloaded(jobs, manifest, folder_index, meta):
+                logger.debug(f"[{i + 1}/{total}] Уже загружено: {meta.get('title')}")
+                if self._status_callback:
+                    self._status_callback(i, "✅ Готово")
+                continue
+            indexed.append((i + 1, total, folder, meta))
+        return order_jobs(indexed, self.scheduling_policy, workers)
+
+    def _download_groups(self, groups):
+        """
+        Общий пул загрузок для одного или нескольких каналов.
+
+        Внутри канала порядок задаёт scheduling_policy, между каналами задачи
+        чередуются по кругу, чтобы канал с 5 видео не ждал канал с 2000.
+        В пул передаётся не больше pool_size задач, поэтому канал, пришедший
+        позже, сразу встаёт в круг. При отмене задачи из очереди снимаются,
+        активные прерываются через progress hook.
+
+        Args:
+            groups: список (папка канала, список мета-данных) или queue.Queue,
+                в которую каналы поступают по мере обхода (None — конец)
+        """
+        if isinstance(groups, queue.Queue):
+            feed, total = groups, "?"
+        else:
+            feed, total = queue.Queue(), sum(len(metas) for _, metas in groups)
+            for group in groups:
+                feed.put(group)
+            feed.put(None)
+
+        with open_job_store(self.output_dir) as jobs:
+            self._jobs = jobs
+            pool_size, task = self.max_workers, self.process_video
+            if self.auto_concurrency:
+                self._controller = AdaptiveConcurrency(
+                    self.max_workers, self.concurrent_fragment_count,
+                    self.auto_workers_range, self.auto_fragments_range, self.auto_interval
+                )
+                pool_size, task = self.auto_workers_range[1], self._process_video_adaptive
+                logger.info(f"[auto] Старт: файлов {self._controller.workers}, потоков {self._controller.fragments}")
+            workers = self._controller.workers if self._controller else self.max_workers
+            logger.debug(f"Политика очереди: {self.scheduling_policy}")
+
+            queued = RoundRobin()
+            running = {}
+            offset = 0
+            fed = False  # Все каналы получены
+            try:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=pool_size) as executor:
+                    while not self.cancelled:
+                        while not fed:
+                            idle = not running and not len(queued)
+                            try:
+                                group = feed.get(block=idle, timeout=0.5)
+                            except queue.Empty:
+                                break
+                            if group is None:
+                                fed = True
+                                break
+                            folder, metadata_list = group
+                            queued.add(self._prepare_group(jobs, folder, metadata_list, offset, total, workers))
+                            offset += len(metadata_list)
+
+                        while len(queued) and len(running) < pool_size:
+                            item = queued.pop()
+                            running[executor.submit(task, item)] = item
+                        if not running:
+                            if fed and not len(queued):
+                                break
+                            continue
+
+                        done, _ = concurrent.futures.wait(
+                            running, timeout=0.5, return_when=concurrent.futures.FIRST_COMPLETED
+                        )
+                        for future in done:
+                            del running[future]
+                            try:
+                                future.result()  # Вызвать исключение, если оно было
+                            except Exception as e:
+                                logger.error(f"Ошибка в задаче: {e}")
+
+                    if self.cancelled:
+                        dropped = queued.clear()
+                        logger.warning(f"🛑 Отмена: снято с очереди {len(dropped)}, "
+                                       f"прерывается активных {len(running)}")
+                        if self._status_callback:
+                            for index, *_ in dropped:
+                                self._status_callback(index - 1, "🛑 Отменено")
+            finally:
+                if self._controller:
+                    logger.info(f"[auto] Итог: файлов {self._controller.workers}, "
+                                f"потоков {self._controller.fragments}")
+                self._jobs = None
+                self._controller = None
+                log_connection_stats()
+
+    def _process_video_adaptive(self, meta_with_index):
+        """process_video с ожиданием слота регулятора AdaptiveConcurrency"""
+        controller = self._controller
+        if not controller.acquire(cancelled=lambda: self.cancelled):
+            return self.process_video(meta_with_index)  # Отмена: только отметка статуса
+        try:
+            return self.process_video(meta_with_index)
+        finally:
+            controller.release()
+
+    def pending_jobs_count(self):
+        """Количество незавершённых задач в jobs.db"""
+        with open_job_store(self.output_dir) as jobs:
+            return jobs.counts().get(jobs.QUEUED, 0)
+
+    def resume_pending(self):
+        """Продолжает загрузки, оставшиеся в очереди jobs.db после перезапуска"""
+        with open_job_store(self.output_dir) as jobs:
+            pending = jobs.pending()
+
+        by_folder = {}
+        for folder, meta in pending:
+            by_folder.setdefault(folder, []).append(meta)
+        for folder, metas in by_folder.items():
+            logger.info(f"▶ Продолжаю загрузку: {folder} ({len(metas)} видео)")
+            os.makedirs(folder, exist_ok=True)
+        if by_folder:
+            self.reset_cancel()
+            self._pause_event.clear()
+            self._download_groups(list(by_folder.items()))
+
+    def _discover_channel(self, url):
+        """
+        Список видео и мета-данные одного канала (для пакетного режима, last_folder
+        не меняется). None — если пакет отменён до или после получения списка.
+        """
+        if self.cancelled:
+            return None
+        known_ids = self.known_video_ids if self.incremental_scan else None
+        links, channel_name = get_video_links(url, known_ids, self.incremental_stop_after, self.api_base)
+        if self.cancelled:
+            return None
+        folder = os.path.join(self.output_dir, channel_name)
+        os.makedirs(folder, exist_ok=True)
+        metas = self.fetch_all_metadata(links, folder)
+        save_metadata_csv(metas, folder)
+        logger.info(f"Канал {channel_name}: видео {len(links)}, мета-данные {len(metas)}")
+        return folder, metas
+
+    def download_channels(self, urls, discovery_workers=None):
+        """
+        Пакетная загрузка нескольких каналов: списки видео и мета-данные
+        собираются параллельно (discovery_workers каналов одновременно), и
+        загрузка канала начинается, как только готов он сам, — общим пулом
+        с чередованием каналов.
+
+        Returns:
+            int: количество каналов, для которых удалось получить список видео
+        """
+        self.reset_cancel()
+        self._pause_event.clear()
+        discovery_workers = discovery_workers or self.discovery_workers
+        feed = queue.Queue()
+        found = []
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, discovery_workers))
+        futures = {executor.submit(self._discover_channel, url): url for url in urls}
+
+        def deliver():
             for future in concurrent.futures.as_completed(futures):
-                if self._cancel_flag:
-                    executor.shutdown(wait=False)
-                    break
                 try:
-                    future.result()  # Вызвать исключение, если оно было
+                    group = future.result()
+                except concurrent.futures.CancelledError:
+                    continue
                 except Exception as e:
-                    logger.error(f"Ошибка в задаче: {e}")
+                    logger.error(f"Ошибка получения списка видео {futures[future]}: {e}")
+                    continue
+                if group is not None:
+                    found.append(group)
+                    logger.info(f"⏬ В очередь загрузки: {os.path.basename(group[0])}, видео {len(group[1])}")
+                    feed.put(group)
+            feed.put(None)
+
+        Thread(target=deliver, daemon=True).start()
+        try:
+            self._download_groups(feed)
+        finally:
+            # При отмене каналы, до которых не дошла очередь, не обходятся
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=not self.cancelled)
+        return len(found)
+
+    def download_channel_streaming(self, url):
+        """
+        Потоковый режим для каналов без участия пользователя: мета-данные и загрузка
+        начинаются, не дожидаясь полного списка видео.
+        """
+        self.reset_cancel()
+        pipeline = StreamingPipeline(self, queue_size=self.pipeline_queue_size)
+        stats = pipeline.run(url)
+        log_connection_stats()
+        return stats
 
     def save_settings(self):
         save_config("", self.output_dir)
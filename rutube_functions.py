@@ -1,18 +1,63 @@
+import bisect
 import csv
+import hashlib
 import json
 import os
+import queue
 import re
+import threading
 import time
 from pathlib import Path
 from typing import Dict, List, Any, TextIO
 
-import requests
-import yt_dlp
-
+from rutube_bandwidth import bandwidth
+from rutube_api import API_BASE, RutubeAPIError, stream_video_links_api
+from rutube_http import http_get
 from rutube_logger import logger
+from rutube_startup import lazy_import
 
-HEADERS = {"User-Agent": "Mozilla/5.0"}
 CONFIG_FILE = "rutube_config.json"
+DEFAULT_CONFIG = {
+    "last_url": "",
+    "download_folder": "rutube_downloads",
+    "concurrent_fragment_count": 4,
+    "max_workers": 1,
+    "metadata_workers": 4,
+    "metadata_extra_fields": [],
+    "pipeline_queue_size": 16,
+    "partial_policy": "resume",
+    "auto_concurrency": False,
+    "auto_workers_range": [1, 8],
+    "auto_fragments_range": [1, 16],
+    "auto_interval": 15,
+    "bandwidth_limit_kbps": 0,
+    "bandwidth_schedule": [],
+    "scheduling_policy": "fifo",
+    "discovery_workers": 3,
+    "http_pool_size": 8,
+    "http_timeout": 15,
+    "http_retries": 3,
+    "log_console_lines": 2000,
+    "async_logging": True,
+    "log_queue_size": 10000,
+    "watch_channels": [],
+    "watch_interval": 3600,
+    "watch_jitter": 0.1,
+    "incremental_scan": False,
+    "incremental_stop_after": 30,
+    "api_base": API_BASE
+}
+# Что делать с фрагментами прерванной загрузки: докачать или начать заново
+PARTIAL_POLICIES = ("resume", "restart")
+# Поля мета-данных, которые хранятся в кэше и передаются в GUI/CSV.
+# Полный ответ yt-dlp (форматы, заголовки, миниатюры) при скачивании
+# извлекается заново внутри ydl.download().
+METADATA_FIELDS = (
+    "id", "title", "description", "upload_date",
+    "duration", "duration_string", "thumbnail", "webpage_url"
+)
+# Параметры yt-dlp для получения мета-данных без загрузки
+METADATA_YDL_OPTS = {"quiet": True, "skip_download": True}
 
 
 class YTDLogger:
@@ -34,15 +79,178 @@ def sanitize_filename(name):
     return re.sub(r'[\\/*?:"<>|]', "_", name).strip()
 
 
-def get_video_links(channel_url):
+class FolderIndex:
+    """
+    Потокобезопасный индекс имён файлов папки канала.
+
+    Строится одним os.scandir на пачку загрузок и обновляется по мере
+    появления/удаления файлов, поэтому проверки в download_video и GUI
+    не сканируют папку заново.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self._lock = threading.Lock()
+        self._names = set()
+        self._sorted = []
+        self.refresh()
+
+    def refresh(self):
+        """Перечитывает содержимое папки"""
+        try:
+            with os.scandir(self.folder) as entries:
+                names = {entry.name for entry in entries if entry.is_file()}
+        except OSError:
+            names = set()
+        with self._lock:
+            self._names = names
+            self._sorted = sorted(names)
+
+    def exists(self, name):
+        with self._lock:
+            return name in self._names
+
+    def with_prefix(self, prefix):
+        """Имена файлов, начинающиеся с prefix"""
+        with self._lock:
+            start = bisect.bisect_left(self._sorted, prefix)
+            result = []
+            for name in self._sorted[start:]:
+                if not name.startswith(prefix):
+                    break
+                result.append(name)
+            return result
+
+    def add(self, name):
+        with self._lock:
+            if name not in self._names:
+                self._names.add(name)
+                bisect.insort(self._sorted, name)
+
+    def discard(self, name):
+        with self._lock:
+            if name in self._names:
+                self._names.discard(name)
+                self._sorted.pop(bisect.bisect_left(self._sorted, name))
+
+
+def video_file_prefix(meta):
+    """Префикс имён файлов видео: ГГГГ.ММ.ДД_ЧЧММ_"""
+    date_raw = (meta.get("upload_date") or "00000000").replace(".", "")
+    duration = (meta.get("duration_string") or "00:00").replace(":", "").zfill(4)
+    return f"{date_raw[:4]}.{date_raw[4:6]}.{date_raw[6:8]}_{duration}_"
+
+
+def video_filename(meta, prefix=None):
+    """Имя .mp4-файла видео (без папки)"""
+    title = re.sub(r'\.(mp4|mkv|avi|mov)$', '', meta.get("title", "Без названия"), flags=re.IGNORECASE)
+    if prefix is None:
+        prefix = video_file_prefix(meta)
+    return f"{prefix}{sanitize_filename(title)}.mp4"
+
+
+def file_checksum(path, chunk_size=1024 * 1024):
+    """SHA-256 файла (читается блоками)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def project_metadata(info, extra_fields=()):
+    """Оставляет в ответе yt-dlp только METADATA_FIELDS и extra_fields"""
+    fields = METADATA_FIELDS + tuple(f for f in extra_fields if f not in METADATA_FIELDS)
+    return {key: info[key] for key in fields if key in info}
+
+
+def get_video_links(channel_url, known_ids=None, stop_after=30, api_base=API_BASE):
+    """
+    Получает ссылки на видео канала: сначала через JSON API,
+    при неудаче — прокруткой страницы в Selenium.
+
+    Args:
+        known_ids: инкрементальный режим — функция (название канала) -> множество
+            уже известных ID; обход останавливается после stop_after известных подряд
+        stop_after: длина серии известных видео для остановки
+        api_base: адрес JSON API (для тестов — локальный сервер с записанными страницами)
+    """
+    try:
+        title, links = stream_video_links_api(channel_url, api_base=api_base)
+        title = sanitize_filename(title)
+        links = sorted(set(_until_known_run(links, known_ids and known_ids(title), stop_after)))
+        logger.info(f"Список видео получен через API: {len(links)}")
+        return links, title
+    except RutubeAPIError as e:
+        logger.warning(f"API недоступно, использую Selenium: {e}")
+    return _get_video_links_selenium(channel_url, known_ids, stop_after)
+
+
+def stream_video_links(channel_url, known_ids=None, stop_after=30, api_base=API_BASE):
+    """
+    Как get_video_links, но ссылки выдаются по мере обхода страниц API.
+    При откате на Selenium весь список собирается сразу.
+
+    Returns:
+        tuple: (название канала, итератор ссылок)
+    """
+    try:
+        title, links = stream_video_links_api(channel_url, api_base=api_base)
+        title = sanitize_filename(title)
+        return title, _until_known_run(links, known_ids and known_ids(title), stop_after)
+    except RutubeAPIError as e:
+        logger.warning(f"API недоступно, использую Selenium: {e}")
+    links, title = _get_video_links_selenium(channel_url, known_ids, stop_after)
+    return title, iter(links)
+
+
+def _until_known_run(links, known, stop_after):
+    """
+    Выдаёт ссылки (от новых к старым), пока не встретится stop_after уже
+    известных видео подряд. Страницы API запрашиваются лениво, поэтому
+    остановка прекращает и обход канала.
+    """
+    run = 0
+    for link in links:
+        yield link
+        if not known:
+            continue
+        if video_id_from_url(link) in known:
+            run += 1
+            if run >= stop_after:
+                logger.info(f"Инкрементальное сканирование: {stop_after} известных видео подряд, обход остановлен")
+                return
+        else:
+            run = 0
+
+
+def _known_tail(hrefs, known):
+    """Длина серии известных видео в конце списка ссылок страницы"""
+    run = 0
+    for href in reversed(list(dict.fromkeys(hrefs))):
+        if video_id_from_url(href) not in known:
+            break
+        run += 1
+    return run
+
+
+def _get_video_links_selenium(channel_url, known_ids=None, stop_after=30):
+    """
+    Список видео прокруткой страницы канала в Selenium (запасной путь).
+
+    Raises:
+        RuntimeError: Selenium не установлен
+    """
     try:
         from selenium import webdriver
         from selenium.webdriver.chrome.service import Service
         from webdriver_manager.chrome import ChromeDriverManager
         from selenium.webdriver.common.by import By
     except ImportError as e:
-        logger.critical("Ошибка", f"Selenium не установлен: {e}")
-        return
+        message = (f"Selenium не установлен ({e}): без него список видео доступен "
+                   f"только через API для ссылок вида https://rutube.ru/channel/<id>/")
+        logger.critical(message)
+        raise RuntimeError(message) from e
 
     if not channel_url.endswith("/videos/"):
         channel_url = channel_url.rstrip("/") + "/videos/"
@@ -56,6 +264,14 @@ def get_video_links(channel_url):
     driver.get(channel_url)
     logger.info("🔄 Загружаю страницу канала...")
 
+    try:
+        raw_title = driver.find_element(By.XPATH, "//meta[@property='og:title']").get_attribute("content")
+        title = raw_title.split("—")[0].strip()
+    except:
+        title = "Unnamed_Channel"
+
+    known = known_ids(sanitize_filename(title)) if known_ids else None
+
     scroll_pause = 2  # Начальная задержка
     max_attempts = 50
     last_height = driver.execute_script("return document.body.scrollHeight")
@@ -75,16 +291,17 @@ def get_video_links(channel_url):
             logger.info("Достигнут конец страницы.")
             break
         last_height = new_height
+        if known:
+            hrefs = driver.execute_script(
+                "return Array.from(document.querySelectorAll(\"a[href^='/video/']\")).map(a => a.href)"
+            )
+            if _known_tail(hrefs, known) >= stop_after:
+                logger.info(f"Инкрементальное сканирование: {stop_after} известных видео подряд, прокрутка остановлена")
+                break
         logger.debug(f"Скролл {attempt + 1}/{max_attempts} | Пауза: {scroll_pause:.1f} сек | Высота: {new_height}px")
         # if new_height == last_height and attempt > 5:  # Если 5 скроллов подряд без изменений
         #     break
 
-    try:
-        raw_title = driver.find_element(By.XPATH, "//meta[@property='og:title']").get_attribute("content")
-        title = raw_title.split("—")[0].strip()
-    except:
-        title = "Unnamed_Channel"
-
     elements = driver.find_elements(By.CSS_SELECTOR, "a[href^='/video/'][href$='/']")
     links = set()
     for el in elements:
@@ -96,11 +313,13 @@ def get_video_links(channel_url):
     return sorted(links), sanitize_filename(title)
 
 
-def fetch_metadata(video_url):
+def fetch_metadata(video_url, extra_fields=None):
+    """Мета-данные одного видео; полный ответ yt-dlp, если extra_fields не задан"""
+    yt_dlp = lazy_import("yt_dlp")
     try:
-        ydl_opts = {'quiet': True, 'skip_download': True}
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            return ydl.extract_info(video_url, download=False)
+        with yt_dlp.YoutubeDL(METADATA_YDL_OPTS) as ydl:
+            info = ydl.extract_info(video_url, download=False)
+            return info if extra_fields is None else project_metadata(info, extra_fields)
     except Exception as e:
         logger.error(f"Ошибка получения мета-данных: {video_url} — {e}")
         return None
@@ -120,25 +339,156 @@ def save_thumbnail(title, thumb_url, folder, prefix):
     if not thumb_url:
         return
     try:
-        response = requests.get(thumb_url, headers=HEADERS)
-        if response.status_code == 200:
-            filename = os.path.join(folder, f"{prefix}{sanitize_filename(title)}.jpg")
-            with open(filename, "wb") as f:
-                f.write(response.content)
+        # Общий пул keep-alive соединений; with возвращает соединение в пул
+        with bandwidth.job() as bw_key, http_get(thumb_url, stream=True) as response:
+            if response.status_code == 200:
+                filename = os.path.join(folder, f"{prefix}{sanitize_filename(title)}.jpg")
+                with open(filename, "wb") as f:
+                    for chunk in response.iter_content(64 * 1024):
+                        bandwidth.consume(bw_key, len(chunk))
+                        f.write(chunk)
     except Exception as e:
         logger.error(f"Ошибка сохранения обложки: {title} — {e}")
 
 
-def download_video(meta, folder, prefix, concurrent_fragment_count=4):
+def byte_delta_hook(callback):
+    """
+    Progress hook для yt-dlp: передаёт в callback приращение скачанных байт.
+
+    Первый вызов для файла только запоминает отправную точку: при докачке
+    .part yt-dlp сразу сообщает downloaded_bytes вместе с байтами на диске,
+    и они не должны учитываться как новый трафик.
+    """
+    last = {}
+
+    def hook(d):
+        if d.get("status") != "downloading":
+            return
+        downloaded = d.get("downloaded_bytes") or 0
+        key = d.get("filename")
+        if key not in last:
+            last[key] = downloaded
+            return
+        delta = downloaded - last[key]
+        last[key] = downloaded
+        if delta > 0:
+            callback(delta)
+
+    return hook
+
+
+def progress_info_hook(callback, interval=0.5):
+    """
+    Progress hook для yt-dlp: не чаще раза в interval секунд (и по завершении)
+    передаёт в callback словарь downloaded / total / speed / eta / fragment / fragments
+    """
+    last = [0.0]
+
+    def hook(d):
+        status = d.get("status")
+        if status not in ("downloading", "finished"):
+            return
+        now = time.monotonic()
+        if status == "downloading" and now - last[0] < interval:
+            return
+        last[0] = now
+        downloaded = d.get("downloaded_bytes") or 0
+        callback({
+            "downloaded": downloaded,
+            "total": d.get("total_bytes") or d.get("total_bytes_estimate") or downloaded,
+            "speed": d.get("speed") if status == "downloading" else None,
+            "eta": d.get("eta") if status == "downloading" else None,
+            "fragment": d.get("fragment_index"),
+            "fragments": d.get("fragment_count"),
+            "finished": status == "finished"
+        })
+
+    return hook
+
+
+def cancel_hook(cancel_event):
+    """Progress hook для yt-dlp: прерывает загрузку, как только установлен cancel_event"""
+    yt_dlp = lazy_import("yt_dlp")
+
+    def hook(d):
+        if cancel_event.is_set():
+            raise yt_dlp.utils.DownloadCancelled("Загрузка отменена пользователем")
+
+    return hook
+
+
+def _is_resumable(folder, names):
+    """
+    Проверяет, можно ли продолжить загрузку по оставшимся фрагментам:
+    .part-файлы не пустые, файл состояния .ytdl читается и содержит
+    номер текущего фрагмента, промежуточных .temp-файлов нет.
+    """
+    if any(name.split(".")[-2] == "temp" for name in names):
+        return False
+
+    parts = [name for name in names if name.endswith(".part") or ".part-" in name]
+    states = [name for name in names if name.endswith(".ytdl")]
+    if not parts:
+        return False
+    # Отдельные фрагменты без файла состояния докачать нельзя
+    if not states and any(".part-" in name for name in parts):
+        return False
+
+    try:
+        for name in parts:
+            if os.path.getsize(os.path.join(folder, name)) == 0:
+                return False
+        for name in states:
+            with open(os.path.join(folder, name), "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if "index" not in state["downloader"]["current_fragment"]:
+                return False
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+    return True
+
+
+def _remove_files(folder, names, folder_index=None):
+    for name in names:
+        try:
+            os.remove(os.path.join(folder, name))
+            if folder_index:
+                folder_index.discard(name)
+        except Exception as e:
+            logger.error(f"Не удалось удалить мусорный файл: {name} — {e}")
+
+
+def download_video(meta, folder, prefix, concurrent_fragment_count=4, partial_policy="resume",
+                   folder_index=None, progress_hooks=None, on_error=None, cancel_event=None):
+    """
+    Скачивает видео с повторными попытками.
+
+    При partial_policy="resume" корректные фрагменты прерванной загрузки
+    докачиваются (continuedl yt-dlp), повреждённые удаляются.
+    folder_index (FolderIndex) — общий индекс папки; без него папка сканируется заново.
+    progress_hooks — progress hooks yt-dlp; on_error(exception) вызывается на каждую неудачную попытку.
+    cancel_event (threading.Event) прерывает активную загрузку через progress hook в течение
+    секунды; фрагменты остаются на диске для докачки.
+
+    Returns:
+        str: путь к готовому файлу
+
+    Raises:
+        yt_dlp.utils.DownloadCancelled: загрузка отменена через cancel_event
+        Exception: последняя ошибка, если все попытки неудачны
+    """
+    yt_dlp = lazy_import("yt_dlp")
     title = meta.get("title", "Без названия")
-    title = re.sub(r'\.(mp4|mkv|avi|mov)$', '', title, flags=re.IGNORECASE)
-    url = meta.get("webpage_url")
-    filename_base = f"{prefix}{sanitize_filename(title)}.mp4"
+    # Полная информация (форматы и т.п.) извлекается yt-dlp заново при скачивании,
+    # поэтому из мета-данных нужна только ссылка
+    url = meta.get("webpage_url") or f"https://rutube.ru/video/{meta.get('id')}/"
+    filename_base = video_filename(meta, prefix)
     filename_mp4 = os.path.join(folder, filename_base)
+    folder_index = folder_index or FolderIndex(folder)
 
     related_garbage = [
-        f for f in os.listdir(folder)
-        if f.startswith(filename_base) and (
+        f for f in folder_index.with_prefix(filename_base)
+        if f != filename_base and (
                 f.endswith(".part") or
                 f.endswith(".ytdl") or
                 ".part-" in f or
@@ -146,50 +496,69 @@ def download_video(meta, folder, prefix, concurrent_fragment_count=4):
         )
     ]
 
-    if os.path.exists(filename_mp4):
+    if folder_index.exists(filename_base):
         if related_garbage:
             logger.info(f"[!] Найдены фрагменты: {related_garbage} — удаляем и перекачиваем: {filename_mp4}")
             try:
                 os.remove(filename_mp4)
+                folder_index.discard(filename_base)
                 for g in related_garbage:
                     os.remove(os.path.join(folder, g))
+                    folder_index.discard(g)
             except Exception as e:
                 logger.error(f"Ошибка при удалении временных файлов: {e}")
-                return
+                raise
         else:
             logger.warning(f"[✓] Уже загружено: {filename_mp4}")
-            return
+            return filename_mp4
     elif related_garbage:
-        logger.error(f"[!] Остатки от старой загрузки — удаляем: {related_garbage}")
-        for g in related_garbage:
-            try:
-                os.remove(os.path.join(folder, g))
-            except Exception as e:
-                logger.error(f"Не удалось удалить мусорный файл: {g} — {e}")
+        if partial_policy == "resume" and _is_resumable(folder, related_garbage):
+            logger.info(f"[↻] Найдены фрагменты — продолжаем загрузку: {filename_mp4}")
+        else:
+            logger.error(f"[!] Остатки от старой загрузки — удаляем: {related_garbage}")
+            _remove_files(folder, related_garbage, folder_index)
 
-    max_retries = 3
-    retry_delays = [2, 5, 10]  # экспоненциальная задержка в секундах
+    hooks = [cancel_hook(cancel_event)] if cancel_event else []
+    hooks += progress_hooks or []
+    with bandwidth.job() as bw_key:
+        hooks.append(byte_delta_hook(lambda count: bandwidth.consume(bw_key, count)))
+        max_retries = 3
+        retry_delays = [2, 5, 10]  # экспоненциальная задержка в секундах
 
-    for attempt in range(max_retries):
-        try:
-            ydl_opts = {
-                "outtmpl": os.path.join(folder, filename_base),
-                "quiet": False,
-                "no_warnings": True,
-                "logger": YTDLogger(),
-                "concurrent_fragment_count": concurrent_fragment_count
-            }
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
-            logger.info(f"Скачано: {filename_mp4}")
-            return
-        except Exception as e:
-            if attempt < max_retries - 1:
-                delay = retry_delays[attempt]
-                logger.warning(f"Попытка {attempt + 1} неудачна. Повтор через {delay}с: {title}")
-                time.sleep(delay)
-            else:
-                logger.error(f"Ошибка загрузки после {max_retries} попыток: {title} — {e}")
+        for attempt in range(max_retries):
+            try:
+                ydl_opts = {
+                    "outtmpl": os.path.join(folder, filename_base),
+                    "quiet": False,
+                    "no_warnings": True,
+                    "logger": YTDLogger(),
+                    "concurrent_fragment_count": concurrent_fragment_count,
+                    "continuedl": partial_policy == "resume",
+                    "progress_hooks": hooks
+                }
+                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                    ydl.download([url])
+                for g in related_garbage:
+                    folder_index.discard(g)
+                folder_index.add(filename_base)
+                logger.info(f"Скачано: {filename_mp4}")
+                return filename_mp4
+            except Exception as e:
+                if isinstance(e, yt_dlp.utils.DownloadCancelled) or (cancel_event and cancel_event.is_set()):
+                    logger.warning(f"🛑 Загрузка прервана, фрагменты сохранены для докачки: {title}")
+                    raise yt_dlp.utils.DownloadCancelled(str(e)) from e
+                if on_error:
+                    on_error(e)
+                if attempt < max_retries - 1:
+                    delay = retry_delays[attempt]
+                    logger.warning(f"Попытка {attempt + 1} неудачна. Повтор через {delay}с: {title}")
+                    if not cancel_event:
+                        time.sleep(delay)
+                    elif cancel_event.wait(delay):
+                        raise yt_dlp.utils.DownloadCancelled("Загрузка отменена пользователем")
+                else:
+                    logger.error(f"Ошибка загрузки после {max_retries} попыток: {title} — {e}")
+                    raise
 
 
 # def save_metadata_csv(metadata_list, folder):
@@ -207,65 +576,146 @@ def save_metadata_csv(metadata_list: List[Dict[str, Any]], folder: str) -> None:
         writer.writerows(metadata_list)
 
 
-def load_cached_metadata(cache_path):
-    if os.path.exists(cache_path):
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {}
+def metadata_size(info):
+    """Оценка объёма ответа для лимита скорости: размер JSON мета-данных"""
+    return len(json.dumps(info, ensure_ascii=False, default=str))
 
 
-def save_metadata_json(metadata_dict, cache_path):
-    with open(cache_path, 'w', encoding='utf-8') as f:
-        json.dump(metadata_dict, f, ensure_ascii=False, indent=2)
+def extract_info_limited(ydl, url):
+    """
+    ydl.extract_info() под общим лимитом скорости. Задача лимитера существует
+    только на время запроса, чтобы простаивающие потоки мета-данных не делили
+    лимит с загрузками; объём ответа оценивается, только если лимит задан.
+    """
+    with bandwidth.job() as bw_key:
+        info = ydl.extract_info(url, download=False)
+        if bandwidth.current_limit():
+            bandwidth.consume(bw_key, metadata_size(info))
+    return info
 
 
-def fetch_and_cache_metadata(video_urls, cache_path):
-    cached = load_cached_metadata(cache_path)
-    new_metadata = {}
-    updated = False
+def _metadata_worker(tasks, results, on_error, on_result, fields):
+    """Поток пула мета-данных: один экземпляр YoutubeDL на все свои URL"""
+    yt_dlp = lazy_import("yt_dlp")
+    with yt_dlp.YoutubeDL(METADATA_YDL_OPTS) as ydl:
+        while True:
+            try:
+                index, url = tasks.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                info = extract_info_limited(ydl, url)
+                results[index] = info if fields is None else project_metadata(info, fields)
+                if on_result:
+                    on_result(url, results[index])
+            except Exception as e:
+                logger.error(f"[!] Не удалось извлечь мета-данные для {url}: {e}")
+                if on_error:
+                    on_error(url, e)
+
+
+def extract_metadata_parallel(video_urls, workers=4, on_error=None, on_result=None, fields=None):
+    """
+    Извлекает мета-данные пулом из workers потоков.
+
+    Args:
+        video_urls: список ссылок на видео
+        workers: максимальное число потоков
+        on_error: callback(url, exception) для URL, которые не удалось обработать
+        on_result: callback(url, info), вызывается в потоке пула сразу после извлечения
+        fields: дополнительные поля для project_metadata (None — полный ответ yt-dlp)
+
+    Returns:
+        list: мета-данные в порядке video_urls (None для неудачных URL)
+    """
+    results = [None] * len(video_urls)
+    if not video_urls:
+        return results
+
+    tasks = queue.Queue()
+    for item in enumerate(video_urls):
+        tasks.put(item)
+
+    threads = [
+        threading.Thread(target=_metadata_worker, args=(tasks, results, on_error, on_result, fields),
+                         daemon=True)
+        for _ in range(max(1, min(workers, len(video_urls))))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
 
-    for url in video_urls:
-        video_id = url.rstrip('/').split('/')[-1]
-        if video_id in cached:
-            new_metadata[video_id] = cached[video_id]
-            continue
-        try:
-            with yt_dlp.YoutubeDL({'quiet': True, 'skip_download': True}) as ydl:
-                info = ydl.extract_info(url, download=False)
-                new_metadata[video_id] = info
-                updated = True
-        except Exception as e:
-            logger.error(f"[!] Не удалось извлечь мета-данные для {url}: {e}")
 
-    if updated:
-        save_metadata_json(new_metadata, cache_path)
+def video_id_from_url(url):
+    return url.rstrip('/').split('/')[-1]
+
+
+def meta_video_id(meta):
+    """ID видео из мета-данных (поле id или последняя часть webpage_url)"""
+    return meta.get("id") or video_id_from_url(meta.get("webpage_url", ""))
+
+
+def fetch_and_cache_metadata(video_urls, store, workers=4, on_error=None, extra_fields=()):
+    """
+    Возвращает мета-данные для video_urls, извлекая из сети только те,
+    которых нет в кэше store (MetadataStore). Каждое новое видео
+    записывается в кэш сразу после извлечения.
+
+    В кэш и результат попадают только METADATA_FIELDS и extra_fields.
+    """
+    video_ids = [video_id_from_url(url) for url in video_urls]
+    cached = store.get_many(video_ids)
+    missing = [url for url, video_id in zip(video_urls, video_ids) if video_id not in cached]
+
+    fetched = {}
+    if missing:
+        logger.info(f"Получаю мета-данные: {len(missing)} (в кэше: {len(cached)}, потоков: {workers})")
+
+        def on_result(url, info):
+            store.upsert(video_id_from_url(url), info)
+
+        for url, info in zip(missing, extract_metadata_parallel(missing, workers, on_error, on_result,
+                                                                   extra_fields)):
+            if info is not None:
+                fetched[video_id_from_url(url)] = info
+
+        failed = len(missing) - len(fetched)
+        if failed:
+            logger.warning(f"Мета-данные не получены для {failed} из {len(video_ids)} видео")
 
-    return list(new_metadata.values())
+    result = []
+    seen = set()
+    for video_id in video_ids:
+        info = cached.get(video_id) or fetched.get(video_id)
+        if info is not None and video_id not in seen:
+            seen.add(video_id)
+            result.append(project_metadata(info, extra_fields))
+    return result
 
 
 def load_config():
     try:
         if Path(CONFIG_FILE).exists():
             with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
+                return {**DEFAULT_CONFIG, **json.load(f)}
     except Exception as e:
         logger.error(f"Ошибка загрузки конфигурации: {e}")
-    return {
-        "last_url": "",
-        "download_folder": "rutube_downloads",
-        "concurrent_fragment_count": 4,
-        "max_workers": 1
-    }
+    return dict(DEFAULT_CONFIG)
 
 
-def save_config(last_url, download_folder, concurrent_fragment_count=4, max_workers=1):
+def save_config(last_url, download_folder, concurrent_fragment_count=4, max_workers=1, **settings):
+    """Сохраняет конфигурацию; прочие ключи файла (и переданные в settings) сохраняются"""
     try:
-        config = {
+        config = load_config()
+        config.update(settings)
+        config.update({
             "last_url": last_url,
             "download_folder": download_folder,
             "concurrent_fragment_count": concurrent_fragment_count,
             "max_workers": max_workers
-        }
+        })
         with open(CONFIG_FILE, "w", encoding="utf-8") as f:
             json.dump(config, f, ensure_ascii=False, indent=2)
     except Exception as e:
@@ -1,25 +1,266 @@
 import os
-import re
+import queue
 import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog
 
 # from rutube_downloader import RutubeDownloader
-from rutube_functions import sanitize_filename, load_config, save_config
+from rutube_functions import load_config, save_config, meta_video_id, video_filename
 from rutube_logger import logger
+from rutube_scheduler import SCHEDULING_POLICIES
+from rutube_startup import mark, preload, report
+
+
+def format_size(count):
+    """Байты в человекочитаемом виде: 512 КБ, 1.4 ГБ"""
+    for unit in ("Б", "КБ", "МБ"):
+        if count < 1024:
+            return f"{count:.0f} {unit}" if unit == "Б" else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.2f} ГБ"
+
+
+def format_eta(seconds):
+    if seconds is None:
+        return ""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
+
+class VideoTable:
+    """
+    Таблица видео с виртуальной прокруткой.
+
+    Данные (мета-данные, выбор, статусы) хранятся в списках Python, а в
+    ttk.Treeview существует только столько строк, сколько помещается в окне:
+    при прокрутке они перезаполняются значениями из модели. Поэтому загрузка,
+    «Выбрать все» и сбор выбранных видео не зависят от числа строк в Tk.
+    """
+    COLUMNS = ("#", "Название", "Дата", "Время", "Загружено", "Скорость", "ETA", "Статус", "✓")
+    WIDTHS = (40, 420, 90, 70, 170, 90, 70, 100, 20)
+    CHECK = "✓"
+
+    def __init__(self, parent, checkbox_column):
+        self.checkbox_column = checkbox_column
+        self.metas = []
+        self.selected = []  # bool на каждую строку
+        self.statuses = []
+        self.progress = []  # Последний прогресс загрузки строки (progress_info_hook) или None
+        self.offset = 0  # Индекс первой видимой строки
+        self._items = []  # Строки Treeview (по числу видимых)
+        self._visible = 0
+
+        self.tree = ttk.Treeview(parent, columns=self.COLUMNS, show="headings", selectmode="browse")
+        for col, width in zip(self.COLUMNS, self.WIDTHS):
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=width, anchor="w" if col == "Название" else "center")
+
+        # Вертикальная прокрутка по модели, горизонтальная — штатная
+        self.vsb = ttk.Scrollbar(parent, orient="vertical", command=self._on_scrollbar)
+        hsb = ttk.Scrollbar(parent, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(xscrollcommand=hsb.set)
+
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.vsb.grid(row=0, column=1, sticky="ns")
+        hsb.grid(row=1, column=0, sticky="ew")
+        parent.grid_rowconfigure(0, weight=1)
+        parent.grid_columnconfigure(0, weight=1)
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_units(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_units(3))
+        self.tree.bind("<Button-1>", self._on_click)
+
+    def __len__(self):
+        return len(self.metas)
+
+    # --- Модель ---
+
+    def load(self, metas):
+        self.metas = list(metas)
+        self.selected = [True] * len(self.metas)
+        self.statuses = ["⏳"] * len(self.metas)
+        self.progress = [None] * len(self.metas)
+        self.offset = 0
+        self.render()
+
+    def set_status(self, row, status):
+        if 0 <= row < len(self.statuses):
+            self.statuses[row] = status
+            self._refresh_row(row)
+
+    def set_progress(self, row, info):
+        if 0 <= row < len(self.progress):
+            self.progress[row] = info
+            self._refresh_row(row)
+
+    def _progress_values(self, row):
+        """Колонки «Загружено», «Скорость», «ETA»"""
+        info = self.progress[row]
+        if not info:
+            return "", "", ""
+        done = format_size(info["downloaded"])
+        if info["total"] and not info["finished"]:
+            done = f"{done} / {format_size(info['total'])}"
+        if info["fragments"] and not info["finished"]:
+            done = f"{done} [{info['fragment']}/{info['fragments']}]"
+        speed = f"{format_size(info['speed'])}/с" if info["speed"] else ""
+        return done, speed, format_eta(info["eta"])
+
+    def set_statuses(self, statuses):
+        self.statuses = list(statuses)
+        self.render()
+
+    def set_all_selected(self, value):
+        self.selected = [value] * len(self.metas)
+        self.render()
+
+    def toggle(self, row):
+        if 0 <= row < len(self.selected):
+            self.selected[row] = not self.selected[row]
+            self._refresh_row(row)
+
+    def selected_rows(self):
+        return [row for row, flag in enumerate(self.selected) if flag]
+
+    def row_values(self, row):
+        """Значения колонок строки row"""
+        meta = self.metas[row]
+        date_raw = meta.get("upload_date", "00000000")
+        duration = meta.get("duration_string", "0:00")
+
+        # Форматирование даты (YYYY.MM.DD)
+        formatted_date = (f"{date_raw[:4]}.{date_raw[4:6]}.{date_raw[6:8]}"
+                          if len(date_raw) == 8 else date_raw)
+
+        # Форматирование времени (HH:MM из длительности)
+        time_parts = duration.split(":")
+        if len(time_parts) == 2:
+            formatted_time = f"{time_parts[0].zfill(2)}:{time_parts[1].zfill(2)}"
+        else:
+            formatted_time = duration
+
+        return (
+            row + 1,  # Колонка #
+            meta.get("title", "Без названия"),  # Колонка "Название"
+            formatted_date,  # Колонка "Дата"
+            formatted_time,  # Колонка "Время"
+            *self._progress_values(row),  # Колонки "Загружено", "Скорость", "ETA"
+            self.statuses[row],  # Колонка "Статус"
+            self.CHECK if self.selected[row] else ""  # Колонка "✓"
+        )
+
+    # --- Отображение ---
+
+    def _row_height(self):
+        style = ttk.Style()
+        return int(style.lookup("Treeview", "rowheight") or 20)
+
+    def _on_resize(self, event):
+        visible = max(1, (event.height - self._row_height()) // self._row_height())  # Без строки заголовков
+        if visible != self._visible:
+            self._visible = visible
+            self.render()
+
+    def render(self):
+        """Перезаполняет видимые строки Treeview из модели"""
+        total = len(self.metas)
+        self.offset = max(0, min(self.offset, total - self._visible))
+        shown = max(0, min(self._visible, total - self.offset))
+
+        while len(self._items) < shown:
+            self._items.append(self.tree.insert("", "end"))
+        for item in self._items[shown:]:
+            self.tree.delete(item)
+        del self._items[shown:]
+
+        for position, item in enumerate(self._items):
+            self.tree.item(item, values=self.row_values(self.offset + position))
+        self._update_scrollbar()
+
+    def _refresh_row(self, row):
+        position = row - self.offset
+        if 0 <= position < len(self._items):
+            self.tree.item(self._items[position], values=self.row_values(row))
+
+    def _update_scrollbar(self):
+        total = len(self.metas)
+        if not total:
+            self.vsb.set(0, 1)
+            return
+        self.vsb.set(self.offset / total, min(1.0, (self.offset + len(self._items)) / total))
+
+    def scroll_to(self, offset):
+        offset = max(0, min(offset, len(self.metas) - self._visible))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def _scroll_units(self, count):
+        self.scroll_to(self.offset + count)
+        return "break"
+
+    def _on_wheel(self, event):
+        return self._scroll_units(-3 if event.delta > 0 else 3)
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(value) * len(self.metas)))
+        elif action == "scroll":
+            step = self._visible if unit == "pages" else 1
+            self.scroll_to(self.offset + int(value) * step)
+
+    def row_at(self, y):
+        """Индекс строки модели под координатой y (или None)"""
+        item = self.tree.identify_row(y)
+        if item not in self._items:
+            return None
+        return self.offset + self._items.index(item)
+
+    def _on_click(self, event):
+        if self.tree.identify_column(event.x) == self.checkbox_column:
+            row = self.row_at(event.y)
+            if row is not None:
+                self.toggle(row)
+
+    def focus_row(self, row):
+        """Прокручивает к строке row и выделяет её"""
+        if not 0 <= row < len(self.metas):
+            return
+        if not self.offset <= row < self.offset + self._visible:
+            self.scroll_to(row - self._visible // 2)
+        position = row - self.offset
+        if 0 <= position < len(self._items):
+            item = self._items[position]
+            self.tree.selection_set(item)
+            self.tree.focus(item)
 
 
 class RutubeGUI:
     # Константы для таблицы
-    CHECKBOX_COLUMN = "#7"
+    CHECKBOX_COLUMN = "#9"
+    UI_TICK_MS = 100  # Период обработки обновлений из фоновых потоков
 
     def __init__(self, downloader):
         self.downloader = downloader
         self.window = tk.Tk()
-        self.row_refs = []
         self.current_metas = []
+        # Фоновые потоки не трогают виджеты: вызовы и статусы строк ставятся
+        # в очередь и применяются в потоке Tk раз в UI_TICK_MS
+        self._ui_calls = queue.Queue()
+        self._ui_lock = threading.Lock()
+        self._row_status = {}  # Номер строки -> последний статус (промежуточные схлопываются)
+        self._row_progress = {}  # Номер строки -> последний прогресс загрузки
+        self._speeds = {}  # Скорость активных загрузок по строкам (только поток Tk)
+        self._percent = 0
+        self._focus_index = None
+        self._progress = None
         self.setup_ui()
         self.load_initial_config()
+        self.window.after(500, self._offer_resume)
+        self.window.after(self.UI_TICK_MS, self._drain_ui_queue)
 
     def setup_ui(self):
         """Инициализация всех компонентов GUI"""
@@ -62,7 +303,12 @@ class RutubeGUI:
             last_url=self.url_entry.get().strip(),
             download_folder=self.path_var.get(),
             concurrent_fragment_count=self.downloader.concurrent_fragment_count,
-            max_workers=self.downloader.max_workers
+            max_workers=self.downloader.max_workers,
+            metadata_workers=self.downloader.metadata_workers,
+            partial_policy=self.downloader.partial_policy,
+            auto_concurrency=self.downloader.auto_concurrency,
+            bandwidth_limit_kbps=self.downloader.bandwidth_limit_kbps,
+            scheduling_policy=self.downloader.scheduling_policy
         )
 
     def _create_url_entry(self):
@@ -101,6 +347,16 @@ class RutubeGUI:
         )
         self.stop_btn.pack(side="left", padx=5)
 
+        # Кнопка "Пауза" / "Продолжить"
+        self.pause_btn = tk.Button(
+            self.top_frame,
+            text="⏸ Пауза",
+            bg="#fff0c0",
+            state="disabled",  # Доступна только во время загрузки
+            command=self._on_pause_toggle
+        )
+        self.pause_btn.pack(side="left", padx=5)
+
         # Кнопка "Настройки"
         self.settings_btn = tk.Button(
             self.top_frame,
@@ -146,33 +402,8 @@ class RutubeGUI:
 
     def _create_table(self):
         """Создание таблицы с видео"""
-        columns = ("#", "Название", "Дата", "Время", "Длительность", "Статус", "✓")
-        self.tree = ttk.Treeview(self.table_frame, columns=columns, show="headings")
-
-        # Настройка заголовков
-        for col in columns:
-            self.tree.heading(col, text=col)
-
-        # Настройка ширины колонок (как в оригинале)
-        self.tree.column("#", width=40, anchor="center")
-        self.tree.column("Название", width=500, anchor="w")
-        self.tree.column("Дата", width=100, anchor="center")
-        self.tree.column("Время", width=80, anchor="center")
-        self.tree.column("Длительность", width=100, anchor="center")
-        self.tree.column("Статус", width=100, anchor="center")
-        self.tree.column("✓", width=20, anchor="center")
-
-        # Прокрутка
-        vsb = ttk.Scrollbar(self.table_frame, orient="vertical", command=self.tree.yview)
-        hsb = ttk.Scrollbar(self.table_frame, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
-
-        # Размещение
-        self.tree.grid(row=0, column=0, sticky="nsew")
-        vsb.grid(row=0, column=1, sticky="ns")
-        hsb.grid(row=1, column=0, sticky="ew")
-        self.table_frame.grid_rowconfigure(0, weight=1)
-        self.table_frame.grid_columnconfigure(0, weight=1)
+        self.table = VideoTable(self.table_frame, self.CHECKBOX_COLUMN)
+        self.tree = self.table.tree
 
     def _create_log_console(self):
         """Консоль логов"""
@@ -189,27 +420,21 @@ class RutubeGUI:
 
     def _on_toggle_all(self):
         """Обработчик чекбокса 'Выбрать все'"""
-        val = "✓" if self.select_all_var.get() else ""
-        for iid in self.tree.get_children():
-            values = list(self.tree.item(iid, "values"))
-            values[-1] = val
-            self.tree.item(iid, values=values)
+        self.table.set_all_selected(self.select_all_var.get())
+
+    def _on_pause_toggle(self):
+        """Обработчик кнопки паузы"""
+        if self.downloader.paused:
+            self.downloader.resume()
+            self.pause_btn.config(text="⏸ Пауза")
+        else:
+            self.downloader.pause()
+            self.pause_btn.config(text="▶ Продолжить")
 
     def _bind_events(self):
         """Привязка обработчиков событий"""
-        self.tree.bind("<Button-1>", self._on_tree_click)
         self.window.protocol("WM_DELETE_WINDOW", self._on_close)
 
-    def _on_tree_click(self, event):
-        """Обработчик клика по таблице"""
-        item = self.tree.identify_row(event.y)
-        col = self.tree.identify_column(event.x)
-
-        if col == "#7":  # Колонка с чекбоксом
-            values = list(self.tree.item(item, "values"))
-            values[-1] = "✓" if values[-1] != "✓" else ""
-            self.tree.item(item, values=values)
-
     def _on_get_list(self):
         """Получение списка видео"""
         url = self.url_entry.get().strip()
@@ -222,9 +447,60 @@ class RutubeGUI:
 
         threading.Thread(target=self._fetch_videos, args=(url,), daemon=True).start()
 
+    def _call_in_ui(self, func, *args):
+        """Выполнить func(*args) в потоке Tk (можно вызывать из любого потока)"""
+        self._ui_calls.put((func, args))
+
+    def _post_status(self, index, status, percent=None):
+        """Статус строки из рабочего потока; за один тик применяется только последний"""
+        with self._ui_lock:
+            self._row_status[index] = status
+            self._focus_index = index
+            if percent is not None:
+                self._progress = percent
+
+    def _post_progress(self, row, info):
+        """Прогресс загрузки строки из рабочего потока (схлопывается так же, как статусы)"""
+        with self._ui_lock:
+            self._row_progress[row] = info
+
+    def _drain_ui_queue(self):
+        """Применяет накопленные обновления в потоке Tk; стоимость тика не зависит от частоты событий"""
+        try:
+            while True:
+                try:
+                    func, args = self._ui_calls.get_nowait()
+                except queue.Empty:
+                    break
+                func(*args)
+
+            with self._ui_lock:
+                statuses, self._row_status = self._row_status, {}
+                focus, self._focus_index = self._focus_index, None
+                percent, self._progress = self._progress, None
+                progress, self._row_progress = self._row_progress, {}
+            for row, info in progress.items():
+                self.table.set_progress(row, info)
+                if info["finished"]:
+                    self._speeds.pop(row, None)
+                else:
+                    self._speeds[row] = info["speed"] or 0
+            for index, status in statuses.items():
+                self._update_row_status(index, status)
+                self._speeds.pop(index, None)
+            if focus is not None:
+                self._focus_row(focus)
+            if percent is not None:
+                self._percent = percent
+            if percent is not None or progress or statuses:
+                self._update_progress(self._percent)
+        except Exception as e:
+            logger.error(f"Ошибка обновления интерфейса: {e}")
+        self.window.after(self.UI_TICK_MS, self._drain_ui_queue)
+
     def _fetch_videos(self, url):
         """Загрузка списка видео с проверкой существующих файлов"""
-        self._update_ui_state(loading=True)
+        self._call_in_ui(self._update_ui_state, True)
         try:
             logger.info("🔄 Получаю список видео с Rutube...")
             links, channel = self.downloader.get_video_links(url)
@@ -234,129 +510,78 @@ class RutubeGUI:
 
             logger.info("📊 Формирую таблицу...")
             self.current_metas = metas
-            self._update_table(metas)
+            self._call_in_ui(self._update_table, metas)
             self._check_existing_files(channel)  # Проверка существующих файлов
 
-            # self.window.after(0, lambda: self._safe_update_table(metas, channel))
-
             logger.info("✅ Список загружен")
 
         except Exception as e:
             logger.error(f"❌ Ошибка: {str(e)}")
         finally:
-            self._update_ui_state(loading=False)
-
-    def _safe_update_table(self, metas, channel):
-        """Потокобезопасное обновление таблицы"""
-        try:
-            logger.debug("Начало обновления таблицы...")
-            self.current_metas = metas
-            self._update_table(metas)
-            self._check_existing_files(channel)
-            logger.info("✅ Таблица успешно обновлена")
-        except Exception as e:
-            logger.error(f"Ошибка обновления таблицы: {e}")
+            self._call_in_ui(self._update_ui_state)
 
     def _check_existing_files(self, channel):
-        """Проверка существующих файлов и обновление статусов (batch-оптимизация)"""
-        # Собираем все ожидаемые пути за один проход
-        expected_files = {}
-        for item_id in self.tree.get_children():
-            values = list(self.tree.item(item_id, "values"))
-            index = int(values[0]) - 1
-            if 0 <= index < len(self.current_metas):
-                meta = self.current_metas[index]
-                path = self._get_video_path(meta, channel)
-                expected_files[item_id] = path
-
-        if not expected_files:
+        """
+        Проверка существующих файлов (в фоновом потоке); статусы строк
+        применяются в потоке Tk одним вызовом
+        """
+        metas = self.current_metas
+        if not metas:
             return
 
-        # Сканируем папку один раз
+        # Сначала манифест (по ID видео), затем общий индекс папки по имени файла
         folder = self.downloader.output_dir
         channel_folder = os.path.join(folder, channel)
-        try:
-            existing = {entry.name for entry in os.scandir(channel_folder) if entry.is_file()}
-        except OSError:
-            existing = set()
-
-        # Обновляем статусы
-        for item_id, path in expected_files.items():
-            filename = os.path.basename(path)
-            values = list(self.tree.item(item_id, "values"))
-            values[5] = "✅ Готово" if filename in existing else "⏳"
-            self.tree.item(item_id, values=values)
-
-    def _get_video_path(self, meta, channel):
-        """Генерация пути к видеофайлу"""
-        title = re.sub(r'\.(mp4|mkv|avi|mov)$', '', meta.get("title", ""), flags=re.IGNORECASE)
-        date_raw = meta.get("upload_date", "00000000").replace(".", "")
-        duration = meta.get("duration_string", "00:00").replace(":", "").zfill(4)
-        prefix = f"{date_raw[:4]}.{date_raw[4:6]}.{date_raw[6:8]}_{duration}_"
-        filename = f"{prefix}{sanitize_filename(title)}.mp4"
-        return os.path.join(self.downloader.output_dir, channel, filename)
+        manifest = self.downloader.get_manifest(channel_folder)
+        index = self.downloader.get_folder_index(channel_folder, refresh=True)
 
-    def _update_table(self, metas):
-        """Обновление таблицы"""
-        self.tree.delete(*self.tree.get_children())
-        self.row_refs = []
-
-        for i, meta in enumerate(metas, 1):
-            self._add_video_row(meta, i)
-
-        if self.row_refs:
-            self.tree.selection_set(self.row_refs[0])
+        statuses = [
+            "✅ Готово" if manifest.is_present(meta_video_id(meta)) or index.exists(video_filename(meta)) else "⏳"
+            for meta in metas
+        ]
+        self._call_in_ui(self._apply_statuses, statuses)
 
-    def _add_video_row(self, meta, index):
-        """Добавление строки в таблицу с корректным распределением данных"""
-        title = meta.get("title", "Без названия")
-        date_raw = meta.get("upload_date", "00000000")
-        duration = meta.get("duration_string", "0:00")
+    def _apply_statuses(self, statuses):
+        """Статусы всех строк таблицы (в потоке Tk)"""
+        self.table.set_statuses(statuses)
 
-        # Форматирование даты (YYYY.MM.DD)
-        formatted_date = (f"{date_raw[:4]}.{date_raw[4:6]}.{date_raw[6:8]}"
-                          if len(date_raw) == 8 else date_raw)
-
-        # Форматирование времени (HH:MM из длительности)
-        time_parts = duration.split(":")
-        if len(time_parts) == 2:
-            formatted_time = f"{time_parts[0].zfill(2)}:{time_parts[1].zfill(2)}"
-        else:
-            formatted_time = duration
-
-        item_id = self.tree.insert("", "end", values=(
-            index,  # Колонка #
-            title,  # Колонка "Название"
-            formatted_date,  # Колонка "Дата"
-            formatted_time,  # Колонка "Время"
-            "00:00",  # Колонка "Длительность"
-            "⏳",  # Колонка "Статус"
-            "✓"  # Колонка "✓"
-        ))
-        self.row_refs.append(item_id)
-        self.tree.see(item_id)
+    def _update_table(self, metas):
+        """Обновление таблицы"""
+        self.select_all_var.set(True)
+        self.table.load(metas)
+        if metas:
+            self.table.focus_row(0)
 
     def _on_download(self):
         """Запуск скачивания"""
-        selected = self._get_selected_videos()
-        if not selected:
+        rows = self.table.selected_rows()
+        if not rows:
             messagebox.showinfo("Информация", "Нет выбранных видео")
             return
+        selected = [self.current_metas[row] for row in rows]
 
-        threading.Thread(target=self._download_videos, args=(selected,), daemon=True).start()
+        threading.Thread(target=self._download_videos, args=(selected, rows), daemon=True).start()
 
-    def _download_videos(self, videos):
-        """Фоновое скачивание"""
-        self._update_ui_state(downloading=True)
-        self.downloader._cancel_flag = False  # Сброс флага отмены
+    def _download_videos(self, videos, rows):
+        """
+        Фоновое скачивание
+
+        Args:
+            videos: мета-данные выбранных видео
+            rows: строки таблицы для них (индекс в videos -> строка)
+        """
+        self._call_in_ui(self._update_ui_state, False, True)
+        self.downloader.reset_cancel()  # Сброс флага отмены
         total = len(videos)
+        finished = [0]
+        finished_lock = threading.Lock()
 
         def progress_callback(index, status):
-            # # Вывод в обе системы
+            # Вызывается из рабочих потоков: виджеты обновляются через _post_status
             current_num = index + 1
 
             # Обработка отмены
-            if self.downloader._cancel_flag:
+            if self.downloader.cancelled and status != "✅ Готово":
                 status = "🛑 Отменено"
 
             # Формируем сообщение
@@ -367,71 +592,82 @@ class RutubeGUI:
 
             logger.info(f"[{current_num} / {total}] {status}")
 
-            # Обновляем интерфейс
-            self._update_row_status(index, status)
-            self._focus_row(index)
-            self._update_progress(int(current_num / total * 100))
-
-            # Прерывание при отмене
-            if self.downloader._cancel_flag:
-                raise KeyboardInterrupt("Загрузка отменена пользователем")
+            with finished_lock:
+                finished[0] += 1
+                percent = int(finished[0] / total * 100)
+            self._post_status(rows[index], status, percent)
 
         try:
             logger.info("⏬ Начало загрузки видео...")
             self.downloader.set_status_callback(progress_callback)
+            self.downloader.set_progress_callback(lambda index, info: self._post_progress(rows[index], info))
             self.downloader.download_all(videos)
-            logger.info(f"✅ Успешно загружено {total} видео")
-
-        except KeyboardInterrupt:
-            logger.error(f"🛑 Загрузка прервана пользователем")
+            if self.downloader.cancelled:
+                logger.error(f"🛑 Загрузка прервана пользователем")
+            else:
+                logger.info(f"✅ Успешно загружено {total} видео")
         except Exception as e:
             logger.error(f"❌ Ошибка загрузки: {str(e)}")
         finally:
-            self._update_ui_state(downloading=False)
+            self.downloader.set_progress_callback(None)
+            self._call_in_ui(self._update_ui_state)
+            self._call_in_ui(self._speeds.clear)
+
+    def _offer_resume(self):
+        """Предложение продолжить загрузки, не завершённые в прошлый запуск"""
+        try:
+            count = self.downloader.pending_jobs_count()
+        except Exception as e:
+            logger.error(f"Ошибка чтения очереди загрузок: {e}")
+            return
+        if count and messagebox.askyesno("Незавершённые загрузки",
+                                         f"Найдено незавершённых загрузок: {count}. Продолжить?"):
+            threading.Thread(target=self._resume_downloads, daemon=True).start()
 
-    def _get_selected_videos(self):
-        """Получение выбранных видео"""
-        selected = []
-        for i, item_id in enumerate(self.tree.get_children()):
-            if self.tree.item(item_id, "values")[-1] == "✓":
-                selected.append(self.current_metas[i])
-        return selected
+    def _resume_downloads(self):
+        """Фоновое продолжение загрузок из очереди"""
+        self._call_in_ui(self._update_ui_state, False, True)
+        try:
+            logger.info("⏬ Продолжение незавершённых загрузок...")
+            self.downloader.set_status_callback(None)  # Строк таблицы для этих видео нет
+            self.downloader.set_progress_callback(None)
+            self.downloader.resume_pending()
+            logger.info("✅ Незавершённые загрузки обработаны")
+        except Exception as e:
+            logger.error(f"❌ Ошибка загрузки: {str(e)}")
+        finally:
+            self._call_in_ui(self._update_ui_state)
 
     def _update_row_status(self, row_index, status):
         """Обновление статуса строки"""
-        if row_index < len(self.row_refs):
-            item_id = self.row_refs[row_index]
-            values = list(self.tree.item(item_id, "values"))
-            values[-2] = status
-            self.tree.item(item_id, values=values)
+        self.table.set_status(row_index, status)
 
     def _focus_row(self, row_index):
         """Фокус на строке"""
-        if row_index < len(self.row_refs):
-            item_id = self.row_refs[row_index]
-            self.tree.see(item_id)
-            self.tree.selection_set(item_id)
-            self.tree.focus(item_id)
+        self.table.focus_row(row_index)
 
     def _update_ui_state(self, loading=False, downloading=False):
         """Обновление состояния интерфейса"""
+        # Новая пачка загрузок стартует без паузы — кнопка всегда начинает с «Пауза»
+        self.pause_btn.config(text="⏸ Пауза", state="normal" if downloading else "disabled")
         state = "disabled" if loading or downloading else "normal"
         self.get_list_btn.config(state=state)
         self.download_btn.config(state=state)
         self.settings_btn.config(state=state)
-        self.window.update()
 
     def _update_progress(self, percent):
         """Обновление прогресс-бара"""
         self.progress_var.set(percent)
-        self.progress_label.config(text=f"Выполнено: {percent}%")
-        self.window.update_idletasks()
+        text = f"Выполнено: {percent}%"
+        if self._speeds:
+            text += f" · {format_size(sum(self._speeds.values()))}/с, загрузок: {len(self._speeds)}"
+        self.progress_label.config(text=text)
 
     def _open_settings_dialog(self):
         """Открытие диалога настроек"""
         dialog = tk.Toplevel(self.window)
         dialog.title("Настройки загрузки")
-        dialog.geometry("300x150")
+        dialog.geometry("320x330")
         dialog.resizable(False, False)
 
         # Поле для потоков скачивания
@@ -444,9 +680,36 @@ class RutubeGUI:
         self.workers_var = tk.IntVar(value=self.downloader.max_workers)
         tk.Spinbox(dialog, from_=1, to=10, textvariable=self.workers_var).grid(row=1, column=1, padx=10, pady=10)
 
+        # Поле для потоков мета-данных
+        tk.Label(dialog, text="Потоков мета-данных:").grid(row=2, column=0, padx=10, pady=10, sticky="w")
+        self.metadata_workers_var = tk.IntVar(value=self.downloader.metadata_workers)
+        tk.Spinbox(dialog, from_=1, to=16, textvariable=self.metadata_workers_var).grid(row=2, column=1, padx=10, pady=10)
+
+        # Докачка прерванных загрузок
+        self.resume_partial_var = tk.BooleanVar(value=self.downloader.partial_policy == "resume")
+        tk.Checkbutton(dialog, text="Докачивать прерванные загрузки",
+                       variable=self.resume_partial_var).grid(row=3, column=0, columnspan=2, padx=10, sticky="w")
+
+        # Автоподбор потоков (значения выше — стартовые)
+        self.auto_concurrency_var = tk.BooleanVar(value=self.downloader.auto_concurrency)
+        tk.Checkbutton(dialog, text="Автоподбор потоков и файлов",
+                       variable=self.auto_concurrency_var).grid(row=4, column=0, columnspan=2, padx=10, sticky="w")
+
+        # Общий лимит скорости
+        tk.Label(dialog, text="Лимит скорости, КБ/с (0 — нет):").grid(row=5, column=0, padx=10, pady=10, sticky="w")
+        self.bandwidth_var = tk.IntVar(value=self.downloader.bandwidth_limit_kbps)
+        tk.Spinbox(dialog, from_=0, to=1000000, increment=256, width=10,
+                   textvariable=self.bandwidth_var).grid(row=5, column=1, padx=10, pady=10)
+
+        # Порядок загрузки
+        tk.Label(dialog, text="Порядок загрузки:").grid(row=6, column=0, padx=10, pady=10, sticky="w")
+        self.policy_var = tk.StringVar(value=self.downloader.scheduling_policy)
+        ttk.Combobox(dialog, textvariable=self.policy_var, values=list(SCHEDULING_POLICIES),
+                     state="readonly", width=10).grid(row=6, column=1, padx=10, pady=10)
+
         # Кнопки
         btn_frame = tk.Frame(dialog)
-        btn_frame.grid(row=2, column=0, columnspan=2, pady=10)
+        btn_frame.grid(row=7, column=0, columnspan=2, pady=10)
         tk.Button(btn_frame, text="Сохранить", command=lambda: self._save_settings(dialog)).pack(side="left", padx=5)
         tk.Button(btn_frame, text="Отмена", command=dialog.destroy).pack(side="left", padx=5)
 
@@ -454,7 +717,11 @@ class RutubeGUI:
         """Сохранение настроек"""
         concurrent = self.concurrent_var.get()
         workers = self.workers_var.get()
-        self.downloader.update_settings(concurrent, workers)
+        metadata_workers = self.metadata_workers_var.get()
+        partial_policy = "resume" if self.resume_partial_var.get() else "restart"
+        self.downloader.update_settings(concurrent, workers, metadata_workers, partial_policy,
+                                        self.auto_concurrency_var.get(), self.bandwidth_var.get(),
+                                        self.policy_var.get())
         dialog.destroy()
 
     def _on_close(self):
@@ -474,8 +741,17 @@ def create_gui(downloader):
     app = RutubeGUI(downloader)
 
     # Только добавляем GUI обработчик к существующему логгеру
-    logger.update_gui_handler(app.log_console)
+    logger.update_gui_handler(app.log_console, load_config().get("log_console_lines", 2000))
     logger.info("Приложение запущено")
+    mark("окно GUI")
+
+    def on_ready():
+        mark("первая отрисовка")
+        report()
+        # yt-dlp загружается в фоне, пока пользователь вводит ссылку
+        preload("requests", "yt_dlp")
+
+    app.window.after_idle(on_ready)
 
     # logger.debug("Отладочная информация")
     # logger.info("Информационное сообщение")
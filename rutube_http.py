@@ -0,0 +1,94 @@
+import threading
+
+from rutube_logger import logger
+from rutube_startup import lazy_import
+
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+# Коды ответа, при которых запрос повторяется с экспоненциальной задержкой
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_settings = {"pool_size": 8, "timeout": 15, "retries": 3}
+_session = None
+_session_lock = threading.Lock()
+
+
+def configure(pool_size=None, timeout=None, retries=None):
+    """
+    Параметры общего пула соединений.
+
+    Args:
+        pool_size: keep-alive соединений на хост (не меньше числа потоков,
+            одновременно скачивающих обложки и страницы API)
+        timeout: тайм-аут подключения и чтения, с
+        retries: повторов при сетевых ошибках и ответах RETRY_STATUSES
+
+    Новые параметры действуют для сессии, созданной после вызова:
+    текущая сессия заменяется при следующем get_session().
+    """
+    global _session
+    with _session_lock:
+        for key, value in (("pool_size", pool_size), ("timeout", timeout), ("retries", retries)):
+            if value is not None:
+                _settings[key] = value
+        _session = None
+
+
+def get_session():
+    """Возвращает общую HTTP-сессию с пулом keep-alive соединений"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            requests = lazy_import("requests")
+            retry = lazy_import("urllib3.util.retry").Retry(
+                total=_settings["retries"],
+                backoff_factor=0.5,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=frozenset(["GET", "HEAD"]),
+                raise_on_status=False
+            )
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=4, pool_maxsize=_settings["pool_size"], max_retries=retry
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def http_get(url, **kwargs):
+    """GET через общую сессию с тайм-аутом по умолчанию"""
+    kwargs.setdefault("timeout", _settings["timeout"])
+    return get_session().get(url, **kwargs)
+
+
+def default_timeout():
+    return _settings["timeout"]
+
+
+def connection_stats():
+    """
+    Статистика пула: запросов, открытых соединений и доля запросов,
+    выполненных на уже открытом (keep-alive) соединении.
+    """
+    with _session_lock:
+        session = _session
+    requests_count = connections = 0
+    if session is not None:
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    requests_count += pool.num_requests
+                    connections += pool.num_connections
+    reuse = 1 - connections / requests_count if requests_count else 0.0
+    return {"requests": requests_count, "connections": connections, "reuse": reuse}
+
+
+def log_connection_stats():
+    stats = connection_stats()
+    if stats["requests"]:
+        logger.debug(f"[http] запросов {stats['requests']}, соединений {stats['connections']}, "
+                     f"повторное использование {stats['reuse']:.0%}")
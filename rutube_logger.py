@@ -1,41 +1,85 @@
+import atexit
 import logging
-import tkinter as tk
+import queue
+import threading
+from collections import deque
 from logging import Filter
 from logging import LogRecord
-from logging.handlers import RotatingFileHandler
-from typing import Optional
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional, TYPE_CHECKING
 
-import colorama
-from colorama import Fore, Style
+if TYPE_CHECKING:  # tkinter нужен только GUI; консольный режим работает без него
+    import tkinter as tk
 
-colorama.init()
+
+_colors = None
+
+
+def _console_colors():
+    """Цвета консоли; colorama загружается при первом создании консольного обработчика"""
+    global _colors
+    if _colors is None:
+        import colorama
+        from colorama import Fore, Style
+        colorama.init()
+        _colors = {
+            'DEBUG': Fore.CYAN,
+            'INFO': Fore.WHITE,
+            # 'INFO': Fore.GREEN,
+            'WARNING': Fore.YELLOW,
+            'ERROR': Fore.RED,
+            'CRITICAL': Fore.RED + Style.BRIGHT,
+            'RESET': Style.RESET_ALL
+        }
+    return _colors
 
 
 class ColoredFormatter(logging.Formatter):
     """Форматтер с цветами для консоли"""
-    COLORS = {
-        'DEBUG': Fore.CYAN,
-        'INFO': Fore.WHITE,
-        # 'INFO': Fore.GREEN,
-        'WARNING': Fore.YELLOW,
-        'ERROR': Fore.RED,
-        'CRITICAL': Fore.RED + Style.BRIGHT
-    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.COLORS = _console_colors()
 
     def format(self, record):
-        color = self.COLORS.get(record.levelname, Fore.WHITE)
+        color = self.COLORS.get(record.levelname, self.COLORS['INFO'])
         message = super().format(record)
-        return f"{color}{message}{Style.RESET_ALL}"
+        return f"{color}{message}{self.COLORS['RESET']}"
+
+
+def is_progress_record(record: LogRecord) -> bool:
+    """Строка прогресса yt-dlp: «[download]  42.0% of ... ETA 00:10»"""
+    if record.levelno != logging.DEBUG:
+        return False
+    msg = record.getMessage()
+    return '[download]' in msg and 'ETA' in msg
 
 
 class GUILogHandler(logging.Handler):
-    """Обработчик для вывода в Tkinter виджет с цветами"""
+    """
+    Обработчик для вывода в Tkinter виджет с цветами.
 
-    def __init__(self, widget: tk.Text):
+    emit() только кладёт запись в кольцевой буфер и безопасен из любого потока;
+    виджет обновляется в потоке Tk раз в FLUSH_MS одной вставкой на пачку.
+    В консоли остаётся не больше max_lines строк, а из строк прогресса yt-dlp
+    за пачку выводится только последняя.
+    """
+    FLUSH_MS = 200
+
+    def __init__(self, widget: "tk.Text", max_lines: int = 2000, summarize_progress: bool = True):
         super().__init__()
         self.widget = widget
+        self.max_lines = max_lines
+        self.summarize_progress = summarize_progress
         self.setFormatter(logging.Formatter('%(message)s'))
+        # Больше max_lines за одну пачку всё равно не поместится в консоль
+        self._buffer = deque(maxlen=max_lines)
+        self._received = 0  # Счётчики для подсчёта вытесненных из буфера записей
+        self._taken = 0
+        self._lock = threading.Lock()
+        self._closed = False
         self._setup_tags()
+        self.widget.after(self.FLUSH_MS, self._flush)
 
     def _setup_tags(self):
         self.widget.tag_config('DEBUG', foreground='cyan')
@@ -45,11 +89,67 @@ class GUILogHandler(logging.Handler):
         self.widget.tag_config('CRITICAL', foreground='red', font=('TkDefaultFont', 12, 'bold'))
 
     def emit(self, record: LogRecord):
-        msg = self.format(record)
-        self.widget.configure(state='normal')
-        self.widget.insert(tk.END, msg + '\n', record.levelname)
-        self.widget.see(tk.END)
-        self.widget.configure(state='disabled')
+        try:
+            entry = (self.format(record), record.levelname, is_progress_record(record))
+            with self._lock:
+                self._buffer.append(entry)
+                self._received += 1
+        except Exception:
+            self.handleError(record)
+
+    def _take(self):
+        """Забирает пачку записей; возвращает (записи, вытеснено из буфера)"""
+        with self._lock:
+            records = list(self._buffer)
+            self._buffer.clear()
+            dropped = self._received - self._taken - len(records)
+            self._taken = self._received
+        return records, dropped
+
+    def _compact(self, records):
+        """Оставляет последнюю строку прогресса пачки, остальные заменяет счётчиком"""
+        progress = [i for i, (_, _, is_progress) in enumerate(records) if is_progress]
+        if len(progress) < 2:
+            return records, 0
+        keep = progress[-1]
+        return [r for i, r in enumerate(records) if not r[2] or i == keep], len(progress) - 1
+
+    def _flush(self):
+        """Выводит накопленные записи (вызывается в потоке Tk)"""
+        if self._closed:
+            return
+        records, dropped = self._take()
+        skipped = 0
+        if self.summarize_progress:
+            records, skipped = self._compact(records)
+        try:
+            if records or dropped:
+                chunks = []
+                if dropped:
+                    chunks += [f"… пропущено строк лога: {dropped}\n", 'WARNING']
+                for msg, level, _ in records:
+                    chunks += [msg + '\n', level]
+                if skipped:
+                    chunks += [f"… строк прогресса: {skipped}\n", 'DEBUG']
+                self.widget.configure(state='normal')
+                self.widget.insert('end', *chunks)
+                self._trim()
+                self.widget.see('end')
+                self.widget.configure(state='disabled')
+            self.widget.after(self.FLUSH_MS, self._flush)
+        except Exception:  # Окно закрыто
+            self._closed = True
+
+    def _trim(self):
+        """Удаляет самые старые строки сверх max_lines"""
+        lines = int(self.widget.index('end-1c').split('.')[0])
+        excess = lines - self.max_lines
+        if excess > 0:
+            self.widget.delete('1.0', f'{excess + 1}.0')
+
+    def close(self):
+        self._closed = True
+        super().close()
 
 
 class DownloadProgressFilter(Filter):
@@ -59,10 +159,41 @@ class DownloadProgressFilter(Filter):
     """
 
     def filter(self, record: LogRecord) -> bool:
-        msg = record.getMessage()
-        if record.levelno == logging.DEBUG and '[download]' in msg and 'ETA' in msg:
-            return False
-        return True
+        return not is_progress_record(record)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler с ограниченной очередью: при переполнении запись
+    отбрасывается (рабочий поток не ждёт), а счётчик dropped растёт.
+    О пропусках сообщает первая запись, прошедшая после переполнения.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._reported = 0
+        self._lock = threading.Lock()
+
+    def enqueue(self, record: LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return
+        with self._lock:
+            lost = self.dropped - self._reported
+            self._reported = self.dropped
+        if lost:
+            warning = logging.makeLogRecord({
+                'name': record.name, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                'msg': f"Очередь лога переполнена, пропущено записей: {lost} (всего {self.dropped})"
+            })
+            try:
+                self.queue.put_nowait(warning)
+            except queue.Full:
+                pass
 
 
 class UniversalLogger:
@@ -79,18 +210,32 @@ class UniversalLogger:
         if not self._initialized:
             self.logger = logging.getLogger('RutubeLogger')
             self.logger.setLevel(logging.DEBUG)  # По умолчанию самый подробный уровень
+            self._handlers = []  # Конечные обработчики (файл, консоль, GUI)
+            self._queue_handler = None
+            self._listener = None
             self._initialized = True
+            atexit.register(self.shutdown)
 
     def setup(self,
               log_file: Optional[str] = 'app.log',
-              gui_widget: Optional[tk.Text] = None,
+              gui_widget: Optional["tk.Text"] = None,
               max_log_size: int = 5 * 1024 * 1024,  # 5 MB
               backup_count: int = 3,
-              log_level: str = 'INFO'):
-        """Настройка обработчиков"""
+              log_level: str = 'INFO',
+              async_mode: bool = False,
+              queue_size: int = 10000):
+        """
+        Настройка обработчиков
+
+        Args:
+            async_mode: рабочие потоки только кладут записи в очередь (queue_size
+                записей), файл, консоль и GUI обслуживает один поток QueueListener
+        """
         # Очистка старых обработчиков
-        for handler in self.logger.handlers[:]:
-            self.logger.removeHandler(handler)
+        self.shutdown()
+        for handler in self._handlers:
+            handler.close()
+        self._handlers = []
 
         # Установка уровня логирования
         level = getattr(logging, log_level.upper(), logging.INFO)
@@ -109,37 +254,70 @@ class UniversalLogger:
             )
             file_handler.setFormatter(formatter)
             file_handler.addFilter(DownloadProgressFilter())  # ← добавили фильтр
-            self.logger.addHandler(file_handler)
+            self._handlers.append(file_handler)
 
         # Консольный обработчик
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(ColoredFormatter('%(message)s'))
-        self.logger.addHandler(console_handler)
+        self._handlers.append(console_handler)
 
         # GUI обработчик (если передан)
         if gui_widget:
             gui_handler = GUILogHandler(gui_widget)
             gui_handler.setFormatter(logging.Formatter('%(message)s'))
-            self.logger.addHandler(gui_handler)
+            self._handlers.append(gui_handler)
+
+        self._queue_handler = BoundedQueueHandler(queue.Queue(maxsize=queue_size)) if async_mode else None
+        self._attach()
 
-    def update_gui_handler(self, widget: tk.Text) -> None:
+    def _attach(self):
+        """Подключает обработчики к логгеру напрямую или через очередь и поток-слушатель"""
+        for handler in self.logger.handlers[:]:
+            self.logger.removeHandler(handler)
+        if self._queue_handler is None:
+            for handler in self._handlers:
+                self.logger.addHandler(handler)
+            return
+        self._listener = QueueListener(self._queue_handler.queue, *self._handlers,
+                                       respect_handler_level=True)
+        self._listener.start()
+        self.logger.addHandler(self._queue_handler)
+
+    def shutdown(self):
+        """Останавливает поток-слушатель, дописав оставшиеся в очереди записи"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    @property
+    def dropped_records(self) -> int:
+        """Сколько записей отброшено из-за переполнения очереди (асинхронный режим)"""
+        return self._queue_handler.dropped if self._queue_handler else 0
+
+    def update_gui_handler(self, widget: "tk.Text", max_lines: int = 2000) -> None:
         """
         Обновляет только GUI обработчик, сохраняя другие настройки логгера
 
         Args:
             widget: Tkinter Text виджет для вывода логов
+            max_lines: сколько последних строк хранить в консоли
         """
         # Удаляем старый GUI обработчик, если он существует
-        for handler in self.logger.handlers[:]:
+        for handler in self._handlers[:]:
             if isinstance(handler, GUILogHandler):
-                self.logger.removeHandler(handler)
+                self._handlers.remove(handler)
+                handler.close()
 
         # Создаем и добавляем новый GUI обработчик
         if widget:
-            gui_handler = GUILogHandler(widget)
+            gui_handler = GUILogHandler(widget, max_lines)
             gui_handler.setFormatter(logging.Formatter('%(message)s'))
             gui_handler.setLevel(self.logger.level)  # Сохраняем текущий уровень логирования
-            self.logger.addHandler(gui_handler)
+            self._handlers.append(gui_handler)
+
+        # Список обработчиков QueueListener неизменяемый — слушатель перезапускается
+        self.shutdown()
+        self._attach()
 
     def debug(self, message):
         self.logger.debug(message)
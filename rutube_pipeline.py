@@ -0,0 +1,157 @@
+import os
+import queue
+import threading
+
+from rutube_functions import (
+    stream_video_links, project_metadata, video_id_from_url, extract_info_limited, METADATA_YDL_OPTS
+)
+from rutube_logger import logger
+from rutube_startup import lazy_import
+from rutube_storage import open_metadata_store
+
+_DONE = object()  # Маркер конца очереди
+
+
+class StreamingPipeline:
+    """
+    Потоковый режим: поиск видео → мета-данные → загрузка.
+
+    Стадии связаны ограниченными очередями, поэтому расход памяти не зависит
+    от размера канала, а загрузка начинается с первого готового видео.
+    """
+
+    def __init__(self, downloader, queue_size=16):
+        self.downloader = downloader
+        self.queue_size = queue_size
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._links = queue.Queue(maxsize=queue_size)
+        self._metas = queue.Queue(maxsize=queue_size)
+        self._active_meta_workers = 0
+        self._counter = 0
+        self.folder = ""  # Папка канала, задаётся в run()
+        self.stats = {"found": 0, "metadata": 0, "processed": 0, "failed": 0}
+
+    def _stopped(self):
+        return self._stop.is_set() or self.downloader.cancelled
+
+    def _put(self, q, item):
+        """Кладёт в очередь, пока стадия не остановлена; False — если остановлена"""
+        while not self._stopped():
+            try:
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q):
+        while not self._stopped():
+            try:
+                return q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+            return self.stats[key]
+
+    def _discover(self, links, meta_workers):
+        try:
+            for link in links:
+                if not self._put(self._links, link):
+                    return
+                self._count("found")
+        except Exception as e:
+            logger.error(f"Ошибка получения списка видео: {e}")
+        finally:
+            for _ in range(meta_workers):
+                self._put(self._links, _DONE)
+
+    def _extract(self, store, download_workers):
+        yt_dlp = lazy_import("yt_dlp")
+        try:
+            with yt_dlp.YoutubeDL(METADATA_YDL_OPTS) as ydl:
+                while True:
+                    link = self._get(self._links)
+                    if link is _DONE:
+                        return
+                    video_id = video_id_from_url(link)
+                    info = store.get(video_id)
+                    if info is None:
+                        try:
+                            full_info = extract_info_limited(ydl, link)
+                            info = project_metadata(full_info, self.downloader.metadata_extra_fields)
+                            store.upsert(video_id, info)
+                        except Exception as e:
+                            logger.error(f"[!] Не удалось извлечь мета-данные для {link}: {e}")
+                            self._count("failed")
+                            continue
+                    self._count("metadata")
+                    if not self._put(self._metas, project_metadata(info, self.downloader.metadata_extra_fields)):
+                        return
+        finally:
+            with self._lock:
+                self._active_meta_workers -= 1
+                last = self._active_meta_workers == 0
+            if last:
+                for _ in range(download_workers):
+                    self._put(self._metas, _DONE)
+
+    def _download(self):
+        while True:
+            meta = self._get(self._metas)
+            if meta is _DONE:
+                return
+            with self._lock:
+                self._counter += 1
+                index = self._counter
+            try:
+                ok = self.downloader.process_video((index, "?", self.folder, meta))
+                self._count("processed" if ok else "failed")
+            except Exception as e:
+                logger.error(f"Ошибка в задаче: {e}")
+                self._count("failed")
+
+    def run(self, channel_url):
+        """
+        Скачивает канал в потоковом режиме.
+
+        Returns:
+            dict: счётчики found / metadata / processed / failed
+        """
+        downloader = self.downloader
+        known_ids = downloader.known_video_ids if downloader.incremental_scan else None
+        channel_name, links = stream_video_links(
+            channel_url, known_ids, downloader.incremental_stop_after, downloader.api_base
+        )
+        folder = os.path.join(self.downloader.output_dir, channel_name)
+        os.makedirs(folder, exist_ok=True)
+        self.downloader.last_folder = folder
+        self.folder = folder
+
+        meta_workers = max(1, self.downloader.metadata_workers)
+        download_workers = max(1, self.downloader.max_workers)
+        self._active_meta_workers = meta_workers
+        logger.info(f"⚡ Потоковая загрузка канала: {channel_name} "
+                    f"(мета-данные: {meta_workers}, загрузка: {download_workers}, очередь: {self.queue_size})")
+
+        with open_metadata_store(folder, self.downloader.metadata_extra_fields) as store:
+            threads = [threading.Thread(target=self._discover, args=(links, meta_workers), daemon=True)]
+            threads += [
+                threading.Thread(target=self._extract, args=(store, download_workers), daemon=True)
+                for _ in range(meta_workers)
+            ]
+            threads += [threading.Thread(target=self._download, daemon=True) for _ in range(download_workers)]
+            for thread in threads:
+                thread.start()
+            try:
+                for thread in threads:
+                    thread.join()
+            finally:
+                self._stop.set()
+
+        logger.info(f"Потоковая загрузка завершена: {self.stats}")
+        return self.stats
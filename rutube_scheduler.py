@@ -0,0 +1,118 @@
+from collections import deque
+
+from rutube_logger import logger
+
+
+def duration_seconds(meta):
+    """Длительность видео в секундах (поле duration или разбор duration_string)"""
+    duration = meta.get("duration")
+    if isinstance(duration, (int, float)):
+        return int(duration)
+    seconds = 0
+    for part in (meta.get("duration_string") or "").split(":"):
+        if not part.isdigit():
+            return 0
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+
+def _size_key(meta):
+    """Оценка «тяжести» видео: размер файла, если известен, иначе длительность"""
+    return meta.get("filesize_approx") or meta.get("filesize") or duration_seconds(meta)
+
+
+def _fifo(items, workers):
+    return list(items)
+
+
+def _shortest_first(items, workers):
+    """Больше готовых видео в час: короткие вперёд"""
+    return sorted(items, key=lambda item: duration_seconds(item[-1]))
+
+
+def _newest_first(items, workers):
+    return sorted(items, key=lambda item: item[-1].get("upload_date") or "", reverse=True)
+
+
+def _size_balanced(items, workers):
+    """
+    Чередует тяжёлые и лёгкие видео: на каждое длинное приходится workers - 1
+    коротких, чтобы все потоки не заняли многочасовые трансляции одновременно.
+    """
+    ordered = sorted(items, key=lambda item: _size_key(item[-1]), reverse=True)
+    result = []
+    head, tail = 0, len(ordered) - 1
+    while head <= tail:
+        result.append(ordered[head])
+        head += 1
+        for _ in range(max(0, workers - 1)):
+            if head > tail:
+                break
+            result.append(ordered[tail])
+            tail -= 1
+    return result
+
+
+SCHEDULING_POLICIES = {
+    "fifo": _fifo,
+    "shortest": _shortest_first,
+    "newest": _newest_first,
+    "balanced": _size_balanced,
+}
+
+
+def register_policy(name, func):
+    """Добавляет политику: func(items, workers) -> items в порядке запуска"""
+    SCHEDULING_POLICIES[name] = func
+
+
+def order_jobs(items, policy="fifo", workers=1):
+    """
+    Упорядочивает задачи загрузки по политике.
+
+    Args:
+        items: список кортежей, последний элемент которых — мета-данные видео
+        policy: имя политики из SCHEDULING_POLICIES
+        workers: число параллельных загрузок
+    """
+    func = SCHEDULING_POLICIES.get(policy)
+    if func is None:
+        logger.warning(f"Неизвестная политика очереди: {policy}, используется fifo")
+        func = _fifo
+    return func(items, workers)
+
+
+class RoundRobin:
+    """
+    Очереди задач нескольких каналов, выдаваемые по кругу: a1, b1, c1, a2, b2, ...
+    Каналы можно добавлять на ходу — новый канал встаёт в круг сразу.
+    """
+
+    def __init__(self):
+        self._queues = []
+        self._turn = 0
+
+    def add(self, items):
+        if items:
+            self._queues.append(deque(items))
+
+    def pop(self):
+        """Следующая задача по кругу (очередь не должна быть пустой)"""
+        current = self._queues[self._turn]
+        item = current.popleft()
+        if current:
+            self._turn += 1
+        else:
+            del self._queues[self._turn]
+        self._turn = self._turn % len(self._queues) if self._queues else 0
+        return item
+
+    def clear(self):
+        """Снимает все оставшиеся задачи и возвращает их"""
+        items = [item for current in self._queues for item in current]
+        self._queues = []
+        self._turn = 0
+        return items
+
+    def __len__(self):
+        return sum(len(current) for current in self._queues)
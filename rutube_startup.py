@@ -0,0 +1,60 @@
+import importlib
+import sys
+import threading
+import time
+
+from rutube_logger import logger
+
+# Момент запуска процесса (модуль импортируется первым в main.py)
+START_TIME = time.perf_counter()
+
+_import_times = {}  # имя модуля -> время импорта, с
+_stages = []  # (этап, момент окончания)
+
+
+def lazy_import(name):
+    """
+    Импортирует тяжёлую зависимость (yt_dlp, requests) при первом обращении
+    и запоминает время импорта для отчёта о запуске.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    elapsed = time.perf_counter() - start
+    _import_times.setdefault(name, elapsed)
+    logger.debug(f"[import] {name}: {elapsed * 1000:.0f} мс")
+    return module
+
+
+def preload(*names):
+    """Фоновый импорт зависимостей, пока пользователь работает с окном"""
+
+    def worker():
+        for name in names:
+            try:
+                lazy_import(name)
+            except ImportError as e:
+                logger.error(f"Не удалось загрузить {name}: {e}")
+
+    threading.Thread(target=worker, name="preload", daemon=True).start()
+
+
+def mark(stage):
+    """Отмечает окончание этапа запуска"""
+    _stages.append((stage, time.perf_counter()))
+
+
+def report():
+    """Пишет в DEBUG-лог длительность этапов запуска и импортов зависимостей"""
+    previous = START_TIME
+    lines = []
+    for stage, moment in _stages:
+        lines.append(f"  {stage}: {(moment - previous) * 1000:.0f} мс")
+        previous = moment
+    for name, elapsed in sorted(_import_times.items(), key=lambda item: -item[1]):
+        lines.append(f"  import {name}: {elapsed * 1000:.0f} мс")
+    total = (previous - START_TIME) * 1000
+    logger.debug(f"[startup] {total:.0f} мс до готовности, модулей загружено: {len(sys.modules)}\n"
+                 + "\n".join(lines))
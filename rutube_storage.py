@@ -0,0 +1,340 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from rutube_functions import project_metadata
+from rutube_logger import logger
+
+METADATA_DB = "metadata.db"
+METADATA_JSON = "metadata.json"
+JOBS_DB = "jobs.db"
+MANIFEST_DB = "manifest.db"
+
+
+class SQLiteStore:
+    """
+    Базовый класс хранилищ: одно соединение на все потоки,
+    доступ к нему защищён Lock.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        raise NotImplementedError
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class MetadataStore(SQLiteStore):
+    """
+    Кэш мета-данных канала в SQLite: одна строка на видео (ключ — ID видео).
+
+    Запись идёт построчно (upsert), поэтому повторное сканирование канала
+    затрагивает только новые видео.
+    """
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS videos (
+                    id TEXT PRIMARY KEY,
+                    upload_date TEXT,
+                    data TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_videos_upload_date ON videos(upload_date);
+                CREATE TABLE IF NOT EXISTS store_info (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            """)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+
+    def get(self, video_id):
+        """Мета-данные одного видео или None"""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM videos WHERE id = ?", (video_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, video_ids):
+        """Словарь {video_id: мета-данные} для найденных в кэше ID"""
+        video_ids = list(video_ids)
+        result = {}
+        chunk = 500  # Ограничение SQLite на число параметров запроса
+        with self._lock:
+            for start in range(0, len(video_ids), chunk):
+                part = video_ids[start:start + chunk]
+                placeholders = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT id, data FROM videos WHERE id IN ({placeholders})", part
+                ).fetchall()
+                result.update((video_id, json.loads(data)) for video_id, data in rows)
+        return result
+
+    def known_ids(self):
+        """Множество ID всех видео в кэше"""
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT id FROM videos")}
+
+    def upsert(self, video_id, info):
+        """Добавляет или обновляет мета-данные одного видео"""
+        self.upsert_many([(video_id, info)])
+
+    def upsert_many(self, items):
+        """Добавляет или обновляет мета-данные пачки видео одной транзакцией"""
+        now = time.time()
+        rows = [
+            (video_id, info.get("upload_date"), json.dumps(info, ensure_ascii=False), now)
+            for video_id, info in items
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO videos (id, upload_date, data, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET upload_date = excluded.upload_date, "
+                "data = excluded.data, updated_at = excluded.updated_at",
+                rows
+            )
+
+    def get_info(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM store_info WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_info(self, key, value):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO store_info (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    def import_json(self, json_path, extra_fields=()):
+        """
+        Импортирует старый кэш metadata.json ({video_id: info}).
+        Полные ответы yt-dlp сокращаются до project_metadata(info, extra_fields).
+
+        Returns:
+            int: количество импортированных видео
+        """
+        with open(json_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        items = [
+            (video_id, project_metadata(info, extra_fields))
+            for video_id, info in cached.items() if isinstance(info, dict)
+        ]
+        self.upsert_many(items)
+        return len(items)
+
+
+def open_metadata_store(folder, extra_fields=()):
+    """
+    Открывает кэш мета-данных канала в папке folder.
+
+    При первом открытии импортирует существующий metadata.json
+    (сам файл не удаляется), оставляя METADATA_FIELDS и extra_fields.
+    """
+    store = MetadataStore(os.path.join(folder, METADATA_DB))
+    json_path = os.path.join(folder, METADATA_JSON)
+    if os.path.exists(json_path) and not store.get_info("json_imported"):
+        try:
+            count = store.import_json(json_path, extra_fields)
+            store.set_info("json_imported", str(time.time()))
+            logger.info(f"Кэш {METADATA_JSON} перенесён в {METADATA_DB}: {count} видео")
+        except (OSError, ValueError) as e:
+            logger.error(f"Ошибка импорта {json_path}: {e}")
+    return store
+
+
+class ManifestStore(SQLiteStore):
+    """
+    Манифест канала: ID видео → путь, размер и контрольная сумма готового файла.
+
+    Записывается по завершении загрузки и проверяется первым, поэтому
+    «уже загружено» не зависит от имени файла (названия, длительности).
+    """
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS manifest (
+                    video_id TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    sha256 TEXT,
+                    completed_at REAL NOT NULL
+                );
+            """)
+
+    def get(self, video_id):
+        """Запись манифеста {path, size, sha256} или None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT path, size, sha256 FROM manifest WHERE video_id = ?", (video_id,)
+            ).fetchone()
+        return {"path": row[0], "size": row[1], "sha256": row[2]} if row else None
+
+    def is_present(self, video_id):
+        """
+        Видео есть в манифесте и файл на месте с тем же размером
+        (один stat, без чтения файла).
+        """
+        entry = self.get(video_id)
+        if not entry:
+            return False
+        try:
+            return os.path.getsize(entry["path"]) == entry["size"]
+        except OSError:
+            return False
+
+    def record(self, video_id, path, size, checksum=None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO manifest (video_id, path, size, sha256, completed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (video_id, path, size, checksum, time.time())
+            )
+
+    def remove(self, video_id):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM manifest WHERE video_id = ?", (video_id,))
+
+
+def open_manifest(folder):
+    """Открывает манифест канала в папке folder"""
+    return ManifestStore(os.path.join(folder, MANIFEST_DB))
+
+
+class JobStore(SQLiteStore):
+    """
+    Очередь загрузок в SQLite (jobs.db в папке загрузок).
+
+    Статусы: queued → running → done / failed. Переживает перезапуск:
+    задачи, оставшиеся в running после аварийного завершения,
+    при открытии возвращаются в queued.
+    """
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._requeue_interrupted()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    video_id TEXT PRIMARY KEY,
+                    folder TEXT NOT NULL,
+                    position INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    bytes INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    meta TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, position);
+            """)
+
+    def _requeue_interrupted(self):
+        with self._lock, self._conn:
+            count = self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+                (self.QUEUED, time.time(), self.RUNNING)
+            ).rowcount
+        if count:
+            logger.warning(f"Прерванные загрузки возвращены в очередь: {count}")
+
+    def enqueue_many(self, items):
+        """
+        Ставит задачи в очередь. Завершённые (done) не трогает,
+        неудачные (failed) возвращает в queued.
+
+        Args:
+            items: список (video_id, folder, meta)
+        """
+        now = time.time()
+        rows = [
+            (video_id, folder, position, self.QUEUED, json.dumps(meta, ensure_ascii=False), now)
+            for position, (video_id, folder, meta) in enumerate(items)
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO jobs (video_id, folder, position, status, meta, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(video_id) DO UPDATE SET folder = excluded.folder, "
+                "position = excluded.position, meta = excluded.meta, updated_at = excluded.updated_at, "
+                "status = CASE WHEN jobs.status = 'done' THEN 'done' ELSE 'queued' END",
+                rows
+            )
+
+    def status(self, video_id):
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM jobs WHERE video_id = ?", (video_id,)).fetchone()
+        return row[0] if row else None
+
+    def is_done(self, video_id):
+        return self.status(video_id) == self.DONE
+
+    def mark_running(self, video_id):
+        self._update(video_id, "status = ?, attempts = attempts + 1", (self.RUNNING,))
+
+    def mark_done(self, video_id, size=0):
+        self._update(video_id, "status = ?, bytes = ?, last_error = NULL", (self.DONE, size))
+
+    def mark_queued(self, video_id):
+        """Возвращает задачу в очередь (например, после отмены)"""
+        self._update(video_id, "status = ?", (self.QUEUED,))
+
+    def mark_failed(self, video_id, error):
+        self._update(video_id, "status = ?, last_error = ?", (self.FAILED, str(error)))
+
+    def _update(self, video_id, assignments, params):
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? WHERE video_id = ?",
+                (*params, time.time(), video_id)
+            )
+
+    def pending(self):
+        """
+        Незавершённые задачи (queued) в исходном порядке.
+
+        Returns:
+            list: (folder, meta)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT folder, meta FROM jobs WHERE status = ? ORDER BY position", (self.QUEUED,)
+            ).fetchall()
+        return [(folder, json.loads(meta)) for folder, meta in rows]
+
+    def counts(self):
+        """Количество задач по статусам"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+
+
+def open_job_store(output_dir):
+    """Открывает очередь загрузок в папке output_dir"""
+    os.makedirs(output_dir, exist_ok=True)
+    return JobStore(os.path.join(output_dir, JOBS_DB))
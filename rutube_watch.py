@@ -0,0 +1,105 @@
+import heapq
+import random
+import time
+
+from rutube_logger import logger
+
+
+class ChannelWatcher:
+    """
+    Режим наблюдения: периодически перепроверяет список каналов и скачивает
+    только новые видео (файлов которых нет в манифесте).
+    Список видео собирается инкрементально — до серии уже известных.
+
+    У каждого канала свой интервал опроса; к каждому интервалу добавляется
+    случайный разброс ±jitter, а первые проверки растянуты на start_spread
+    секунд, чтобы десятки каналов не опрашивались одновременно.
+    """
+
+    def __init__(self, downloader, channels, interval=3600, jitter=0.1, start_spread=30.0):
+        """
+        Args:
+            downloader: RutubeDownloader
+            channels: список URL или словарей {"url": ..., "interval": секунд}
+            interval: интервал опроса по умолчанию, с
+            jitter: доля случайного разброса интервала (0.1 — ±10%)
+            start_spread: разброс первых проверок, с
+        """
+        self.downloader = downloader
+        self.channels = [
+            {"url": item} if isinstance(item, str) else dict(item) for item in channels
+        ]
+        self.interval = interval
+        self.jitter = jitter
+        self.start_spread = start_spread
+        self._schedule = []  # (момент проверки, номер канала)
+
+    def _interval(self, channel):
+        base = channel.get("interval") or self.interval
+        return base * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def check(self, channel):
+        """
+        Проверяет один канал и скачивает новые видео.
+
+        Returns:
+            int: количество новых видео
+        """
+        downloader = self.downloader
+        url = channel["url"]
+        links, channel_name = downloader.get_video_links(url, incremental=True)
+        new_links = downloader.new_video_links(links)
+        if not new_links:
+            logger.info(f"[watch] {channel_name}: новых видео нет ({len(links)} всего)")
+            return 0
+        logger.info(f"[watch] {channel_name}: новых видео {len(new_links)} из {len(links)}")
+        metas = downloader.fetch_all_metadata(new_links)
+        if downloader.cancelled:  # download_all сбрасывает отмену — проверяем до него
+            return 0
+        downloader.download_all(metas)
+        return len(new_links)
+
+    def _stopped(self):
+        return self.downloader.cancelled
+
+    def _sleep_until(self, moment):
+        """Ждёт до moment, раз в секунду проверяя отмену; False — если отменено"""
+        while not self._stopped():
+            remaining = moment - time.monotonic()
+            if remaining <= 0:
+                return True
+            time.sleep(min(remaining, 1.0))
+        return False
+
+    def run(self, once=False):
+        """
+        Цикл наблюдения до отмены (downloader.cancel_download()).
+
+        Args:
+            once: проверить каждый канал один раз и выйти
+        """
+        if not self.channels:
+            logger.warning("[watch] Список каналов пуст")
+            return
+        now = time.monotonic()
+        self._schedule = [(now + random.uniform(0, self.start_spread), i) for i in range(len(self.channels))]
+        heapq.heapify(self._schedule)
+        logger.info(f"[watch] Наблюдение за каналами: {len(self.channels)}")
+
+        while self._schedule:
+            moment, i = heapq.heappop(self._schedule)
+            if not self._sleep_until(moment):
+                break
+            channel = self.channels[i]
+            try:
+                self.check(channel)
+            except Exception as e:
+                logger.error(f"[watch] Ошибка проверки {channel['url']}: {e}")
+            if self._stopped():
+                break
+            if not once:
+                next_check = time.monotonic() + self._interval(channel)
+                heapq.heappush(self._schedule, (next_check, i))
+                logger.debug(f"[watch] Следующая проверка {channel['url']} "
+                             f"через {(next_check - time.monotonic()) / 60:.0f} мин")
+        logger.info("[watch] Наблюдение остановлено")
@@ -0,0 +1,84 @@
+"""
+Решения AIMD-регулятора AdaptiveConcurrency при interval=0: каждое
+record_* закрывает окно, время окна задаёт подменённый time.monotonic.
+"""
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rutube_concurrency  # noqa: E402
+from rutube_concurrency import AdaptiveConcurrency  # noqa: E402
+from rutube_functions import byte_delta_hook  # noqa: E402
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Время, которое сдвигается на секунду при каждом обращении"""
+    now = [0.0]
+
+    def monotonic():
+        now[0] += 1.0
+        return now[0]
+
+    monkeypatch.setattr(rutube_concurrency, "time", types.SimpleNamespace(monotonic=monotonic))
+    return now
+
+
+def _controller(workers=2, fragments=4):
+    return AdaptiveConcurrency(workers, fragments, (1, 4), (1, 8), interval=0)
+
+
+def test_growing_throughput_increases_knobs_in_turn(clock):
+    c = _controller()
+
+    c.record_bytes(1 * MB)
+    assert (c.workers, c.fragments) == (3, 4)
+    c.record_bytes(2 * MB)
+    assert (c.workers, c.fragments) == (3, 5)
+
+
+def test_throughput_drop_rolls_back_last_increase(clock):
+    c = _controller()
+    c.record_bytes(4 * MB)  # Увеличение workers
+    c.record_bytes(4 * MB)  # Увеличение fragments
+
+    c.record_bytes(1 * MB)
+
+    assert (c.workers, c.fragments) == (3, 4)
+    c.record_bytes(1 * MB // 2)  # Откатывать больше нечего
+    assert (c.workers, c.fragments) == (3, 4)
+
+
+def test_errors_halve_both_knobs(clock):
+    c = _controller(workers=4, fragments=8)
+
+    c.record_error()
+
+    assert (c.workers, c.fragments) == (2, 4)
+
+
+def test_increase_is_clamped_to_range(clock):
+    c = _controller(workers=4, fragments=8)
+
+    c.record_bytes(1 * MB)
+    c.record_bytes(2 * MB)
+
+    assert (c.workers, c.fragments) == (4, 8)
+
+
+def test_resumed_part_does_not_inflate_first_window(clock):
+    c = _controller()
+    hook = byte_delta_hook(c.record_bytes)
+
+    hook({"status": "downloading", "downloaded_bytes": 2700 * MB, "filename": "v.part"})
+    hook({"status": "downloading", "downloaded_bytes": 2701 * MB, "filename": "v.part"})
+    hook({"status": "downloading", "downloaded_bytes": 2702 * MB, "filename": "v.part"})
+
+    # Первое окно — 1 МБ, второе не медленнее: два увеличения, без отката
+    assert (c.workers, c.fragments) == (3, 5)
@@ -0,0 +1,88 @@
+"""
+Обход списка видео канала против локального стаб-сервера,
+отдающего записанные страницы JSON API из tests/data.
+"""
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rutube_functions import get_video_links, stream_video_links  # noqa: E402
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+CHANNEL_URL = "https://rutube.ru/channel/123/"
+ALL_IDS = [f"{i:032x}" for i in range(1, 8)]
+
+
+class _RecordedAPI(BaseHTTPRequestHandler):
+    """Отдаёт tests/data/<путь>.json и запоминает запрошенные страницы"""
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        name = parts.path.strip("/")[len("api/"):].replace("/", "_")
+        page = parse_qs(parts.query).get("page")
+        if page:
+            name += f"_page{page[0]}"
+        self.server.requested.append(name)
+        path = os.path.join(DATA_DIR, name + ".json")
+        if not os.path.exists(path):
+            self.send_error(404)
+            return
+        with open(path, "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RecordedAPI)
+    server.requested = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _api_base(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/api"
+
+
+def _ids(links):
+    return [link.rstrip("/").rsplit("/", 1)[-1] for link in links]
+
+
+def test_pages_until_has_next_false(api):
+    links, title = get_video_links(CHANNEL_URL, api_base=_api_base(api))
+
+    assert title == "Тестовый канал"
+    assert sorted(_ids(links)) == ALL_IDS
+    assert api.requested == [
+        "profile_user_123",
+        "video_person_123_page1",
+        "video_person_123_page2",
+        "video_person_123_page3",
+    ]
+
+
+def test_incremental_scan_stops_after_known_run(api):
+    known = set(ALL_IDS[1:])  # Новое только первое видео
+    title, links = stream_video_links(
+        CHANNEL_URL, known_ids=lambda channel: known, stop_after=2, api_base=_api_base(api)
+    )
+
+    assert _ids(links) == ALL_IDS[:3]
+    assert "video_person_123_page2" not in api.requested
@@ -0,0 +1,112 @@
+"""
+RutubeDownloader без сети: process_video и обход каналов подменяются,
+проверяются решение «скачивать или пропустить» по jobs.db, манифесту
+и папке канала и порядок запуска в пакетном режиме.
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rutube_downloader  # noqa: E402
+from rutube_downloader import RutubeDownloader  # noqa: E402
+from rutube_functions import video_filename  # noqa: E402
+from rutube_storage import open_job_store  # noqa: E402
+
+VIDEO_ID = "c" * 32
+META = {"id": VIDEO_ID, "title": "Видео", "upload_date": "20250101"}
+LINK = f"https://rutube.ru/video/{VIDEO_ID}/"
+
+
+@pytest.fixture
+def downloader(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # rutube_config.json не читается из рабочей папки
+    d = RutubeDownloader()
+    d.output_dir = str(tmp_path / "downloads")
+    d.last_folder = os.path.join(d.output_dir, "channel")
+    os.makedirs(d.last_folder)
+    d.started = []
+    monkeypatch.setattr(d, "process_video", lambda item: d.started.append(item[3]["id"]) or True)
+    return d
+
+
+def _mark_done(d):
+    with open_job_store(d.output_dir) as jobs:
+        jobs.enqueue_many([(VIDEO_ID, d.last_folder, META)])
+        jobs.mark_done(VIDEO_ID, 123)
+
+
+def test_done_job_without_file_is_downloaded_again(downloader):
+    _mark_done(downloader)
+
+    assert downloader.new_video_links([LINK]) == [LINK]
+    downloader.download_all([META])
+
+    assert downloader.started == [VIDEO_ID]
+    assert downloader.pending_jobs_count() == 1  # mark_queued; process_video подменён
+
+
+def test_done_job_with_file_is_skipped(downloader):
+    _mark_done(downloader)
+    with open(os.path.join(downloader.last_folder, video_filename(META)), "wb") as f:
+        f.write(b"video")
+
+    downloader.download_all([META])
+
+    assert downloader.started == []
+    assert downloader.pending_jobs_count() == 0
+
+
+def test_manifest_entry_closes_job(downloader):
+    path = os.path.join(downloader.last_folder, video_filename(META))
+    with open(path, "wb") as f:
+        f.write(b"video")
+    downloader.get_manifest().record(VIDEO_ID, path, 5)
+
+    assert downloader.new_video_links([LINK]) == []
+    downloader.download_all([META])
+
+    assert downloader.started == []
+    assert downloader.pending_jobs_count() == 0
+
+
+def test_batch_starts_channel_without_waiting_for_slower_ones(downloader, monkeypatch):
+    slow_release = threading.Event()
+    fast_folder = os.path.join(downloader.output_dir, "fast")
+    slow_folder = os.path.join(downloader.output_dir, "slow")
+
+    def discover(url):
+        if url == "slow":
+            assert slow_release.wait(5)
+            return slow_folder, [{"id": "s" * 32, "title": "slow"}]
+        return fast_folder, [{"id": "f" * 32, "title": "fast"}]
+
+    def process(item):
+        downloader.started.append(item[3]["title"])
+        slow_release.set()  # Медленный канал «дообходится» только после старта быстрого
+        return True
+
+    monkeypatch.setattr(downloader, "_discover_channel", discover)
+    monkeypatch.setattr(downloader, "process_video", process)
+
+    assert downloader.download_channels(["slow", "fast"], discovery_workers=2) == 2
+    assert downloader.started == ["fast", "slow"]
+
+
+def test_cancel_during_discovery_skips_remaining_channels(downloader, monkeypatch):
+    discovered = []
+
+    def get_video_links(url, *args):
+        discovered.append(url)
+        downloader.cancel_download()  # Ctrl+C во время обхода первого канала
+        return [], url
+
+    monkeypatch.setattr(rutube_downloader, "get_video_links", get_video_links)
+
+    downloader.download_channels(["a", "b", "c"], discovery_workers=1)
+
+    assert discovered == ["a"]
+    assert downloader.started == []
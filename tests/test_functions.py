@@ -0,0 +1,37 @@
+"""Progress hooks yt-dlp из rutube_functions"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rutube_functions import byte_delta_hook  # noqa: E402
+
+GB = 1024 ** 3
+
+
+def _progress(downloaded, filename="video.mp4.part"):
+    return {"status": "downloading", "downloaded_bytes": downloaded, "filename": filename}
+
+
+def test_resumed_part_is_not_charged():
+    charged = []
+    hook = byte_delta_hook(charged.append)
+
+    hook(_progress(int(2.7 * GB)))  # Первый вызов докачки: байты уже на диске
+    hook(_progress(int(2.7 * GB) + 1000))
+    hook(_progress(int(2.7 * GB) + 3000))
+
+    assert charged == [1000, 2000]
+
+
+def test_deltas_are_tracked_per_file():
+    charged = []
+    hook = byte_delta_hook(charged.append)
+
+    hook(_progress(0, "a.part"))
+    hook(_progress(500, "b.part"))
+    hook(_progress(100, "a.part"))
+    hook(_progress(800, "b.part"))
+    hook({"status": "finished", "downloaded_bytes": 900, "filename": "b.part"})
+
+    assert charged == [100, 300]
@@ -0,0 +1,26 @@
+"""Порядок задач rutube_scheduler"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rutube_scheduler import RoundRobin  # noqa: E402
+
+
+def test_round_robin_alternates_channels():
+    queue = RoundRobin()
+    queue.add(["a1", "a2", "a3"])
+    queue.add(["b1"])
+    queue.add([])
+
+    assert [queue.pop() for _ in range(len(queue))] == ["a1", "b1", "a2", "a3"]
+
+
+def test_channel_added_later_joins_the_circle():
+    queue = RoundRobin()
+    queue.add(["a1", "a2", "a3"])
+    first = queue.pop()
+    queue.add(["b1", "b2"])
+
+    assert [first] + [queue.pop() for _ in range(len(queue))] == ["a1", "a2", "b1", "a3", "b2"]
+    assert queue.clear() == []